@@ -1,12 +1,34 @@
 # -*- coding: utf-8 -*-
 import logging
 from pathlib import Path
+import os
 import json
+import base64
+import hashlib
 import datetime
 import textwrap
-import requests
+import random
+import socket
+import struct
 import subprocess
-from time import sleep
+import shutil
+import importlib.util
+import shlex
+import tempfile
+import threading
+import heapq
+import itertools
+import fnmatch
+from email.utils import parsedate_to_datetime
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from time import sleep, monotonic, time_ns
+# Cross-process lock, not available on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Error handling
 a4zlog = logging.getLogger(__name__)
@@ -17,34 +39,918 @@ class API():
         self.Telegram   = "https://api.telegram.org/bot"
         self.ZeroSSL    = "https://api.zerossl.com/certificates"
 
+# Shared HTTP transport, keep-alive connection pool per host with retry and backoff
+class Transport():
+    # Process-wide instance
+    SharedInstance = None
+    SharedLock     = threading.Lock()
+
+    def __init__(self,PoolSize=10,RetryTotal=3,BackoffFactor=0.5,BackoffMax=30,Limiter=None):
+        self.PoolSize      = PoolSize
+        self.RetryTotal    = RetryTotal
+        self.BackoffFactor = BackoffFactor
+        self.BackoffMax    = BackoffMax
+        # Retry status, POST only retry when server didn't process request
+        self.RetryStatus   = (429,500,502,503,504)
+        self.RetryPOST     = (429,503)
+        # Retry-After ceiling
+        self.RetryAfterMax = 300
+        # Session create on first request
+        self.Session       = None
+        self.Adapter       = None
+        self.Lock          = threading.Lock()
+        self.Retries       = 0
+        # Provider rate limiter, shared between processes
+        self.Limiter       = Limiter
+
+    # Shared transport, pool size and retry from optional Connection section
+    @classmethod
+    def Shared(cls,Config=None):
+        with cls.SharedLock:
+            if cls.SharedInstance is None:
+                ConnectionConfig = (Config or {}).get("Connection",{})
+                cls.SharedInstance = cls(
+                    PoolSize=ConnectionConfig.get("PoolSize",10),
+                    RetryTotal=ConnectionConfig.get("Retry",3),
+                    BackoffFactor=ConnectionConfig.get("Backoff",0.5),
+                    BackoffMax=ConnectionConfig.get("BackoffMax",30),
+                    Limiter=RateLimiter.FromConfig(Config))
+            return cls.SharedInstance
+
+    # Keep-alive session with connection pool
+    def Connect(self):
+        with self.Lock:
+            if self.Session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                Session = requests.Session()
+                # Retry handled by Request, adapter only pooling
+                self.Adapter = HTTPAdapter(pool_connections=self.PoolSize,pool_maxsize=self.PoolSize,max_retries=0)
+                Session.mount("https://",self.Adapter)
+                Session.mount("http://",self.Adapter)
+                self.Session = Session
+            return self.Session
+
+    # Exponential backoff with jitter
+    def Backoff(self,Attempt):
+        BackoffDelay = min(self.BackoffMax,self.BackoffFactor * (2 ** Attempt))
+        return random.uniform(BackoffDelay / 2,BackoffDelay)
+
+    # Retry-After header, seconds or HTTP date
+    def RetryAfter(self,Response):
+        RetryAfterValue = Response.headers.get("Retry-After")
+        if not RetryAfterValue:
+            return None
+        try:
+            RetryDelay = float(RetryAfterValue)
+        except ValueError:
+            try:
+                RetryDate = parsedate_to_datetime(RetryAfterValue)
+                RetryDelay = (RetryDate - datetime.datetime.now(tz=datetime.timezone.utc)).total_seconds()
+            except Exception:
+                return None
+        return min(max(RetryDelay,0),self.RetryAfterMax)
+
+    # Sending request, retry on connection error, 429 and 5xx
+    def Request(self,Method,URL,Retry=None,Provider=None,**RequestArgs):
+        import requests
+        Session = self.Connect()
+        RetryTotal = self.RetryTotal if Retry is None else Retry
+        IsPOST = Method.upper() == "POST"
+        RetryStatus = self.RetryPOST if IsPOST else self.RetryStatus
+        # POST only retry when connection never established
+        RetryError = requests.exceptions.ConnectTimeout if IsPOST else requests.exceptions.ConnectionError
+        Attempt = 0
+        while True:
+            if Provider and self.Limiter is not None:
+                self.Limiter.Acquire(Provider)
+            try:
+                Response = Session.request(Method,URL,**RequestArgs)
+            except RetryError as RequestError:
+                if Attempt >= RetryTotal:
+                    raise
+                a4zlog.info(f"Retry request |{URL.split('?')[0]} |{RequestError}")
+                RetryDelay = self.Backoff(Attempt)
+            else:
+                if Response.status_code not in RetryStatus or Attempt >= RetryTotal:
+                    return Response
+                a4zlog.info(f"Retry request |{URL.split('?')[0]} |HTTP {Response.status_code}")
+                RetryDelay = self.RetryAfter(Response)
+                if RetryDelay is None:
+                    RetryDelay = self.Backoff(Attempt)
+                # Rate limited, hold every process using this provider
+                elif Provider and self.Limiter is not None and Response.status_code == 429:
+                    self.Limiter.Block(Provider,RetryDelay)
+                Response.close()
+            Attempt += 1
+            with self.Lock:
+                self.Retries += 1
+            sleep(RetryDelay)
+
+    # Connection reuse statistics per host
+    def Stats(self):
+        ConnectionStats = {"retries":self.Retries,"hosts":{}}
+        if self.Adapter is None:
+            return ConnectionStats
+        PoolManager = self.Adapter.poolmanager
+        for PoolKey in list(PoolManager.pools.keys()):
+            Pool = PoolManager.pools.get(PoolKey)
+            if Pool is None:
+                continue
+            ConnectionStats["hosts"][Pool.host] = {
+                "connections":Pool.num_connections,
+                "requests":Pool.num_requests,
+                "reused":max(Pool.num_requests - Pool.num_connections,0)}
+        return ConnectionStats
+
+    # Close pooled connections
+    def Close(self):
+        with self.Lock:
+            if self.Session is not None:
+                self.Session.close()
+                self.Session = None
+                self.Adapter = None
+
+# Lock for state file shared between processes, thread lock only when fcntl not available
+class StateLock():
+    def __init__(self,StateFile):
+        self.LockFile = Path(StateFile).with_name(f"{Path(StateFile).name}.lock")
+        self.Lock     = threading.Lock()
+
+    # Exclusive lock across threads and processes
+    def Run(self,Function):
+        with self.Lock:
+            if fcntl is None:
+                return Function()
+            self.LockFile.parent.mkdir(parents=True,exist_ok=True)
+            with open(self.LockFile,"a") as LockHandle:
+                fcntl.flock(LockHandle.fileno(),fcntl.LOCK_EX)
+                try:
+                    return Function()
+                finally:
+                    fcntl.flock(LockHandle.fileno(),fcntl.LOCK_UN)
+
+# Token bucket rate limiter per provider, state file shared between processes
+class RateLimiter():
+    # Requests per second and burst size, Cloudflare allow 1200 requests per 5 minutes
+    Defaults = {
+        "ZeroSSL":{"Rate":2,"Burst":10},
+        "Cloudflare":{"Rate":4,"Burst":20}}
+
+    def __init__(self,StateFile,Providers=None):
+        self.StateFile = Path(StateFile)
+        self.Lock      = StateLock(self.StateFile)
+        self.Providers = {}
+        for ProviderName,ProviderDefault in self.Defaults.items():
+            self.Providers[ProviderName] = dict(ProviderDefault)
+        for ProviderName,ProviderLimit in (Providers or {}).items():
+            self.Providers.setdefault(ProviderName,{"Rate":1,"Burst":1}).update(ProviderLimit)
+        # Waiting time ceiling for single sleep, re-check state after
+        self.WaitMax   = 60
+
+    # Limiter from optional RateLimit section, disabled with "Enabled": false
+    @classmethod
+    def FromConfig(cls,Config=None):
+        LimitConfig = dict((Config or {}).get("RateLimit",{}))
+        if not LimitConfig.pop("Enabled",True):
+            return None
+        StateFile = LimitConfig.pop("StateFile",None) or Path(tempfile.gettempdir(),"acme4zerossl.ratelimit.json")
+        return cls(StateFile,LimitConfig)
+
+    # Exclusive lock across threads and processes
+    def Locked(self,Function):
+        return self.Lock.Run(Function)
+
+    # Reading bucket state, broken or missing file start with full buckets
+    def ReadState(self):
+        try:
+            with open(self.StateFile,"r",encoding="utf-8") as StateContent:
+                State = json.load(StateContent)
+            return State if isinstance(State,dict) else {}
+        except (OSError,ValueError):
+            return {}
+
+    # Refill bucket by elapsed time
+    def Refill(self,State,Provider,Now):
+        Limit = self.Providers.get(Provider,{"Rate":1,"Burst":1})
+        Bucket = State.get(Provider) or {"tokens":float(Limit["Burst"]),"updated":Now,"blocked":0}
+        Elapsed = max(Now - Bucket.get("updated",Now),0)
+        Bucket["tokens"] = min(float(Limit["Burst"]),Bucket.get("tokens",0) + Elapsed * Limit["Rate"])
+        Bucket["updated"] = Now
+        State[Provider] = Bucket
+        return Bucket,Limit
+
+    # Taking one token, return waiting seconds or 0 when granted
+    def TryAcquire(self,Provider):
+        def Take():
+            Now = time_ns() / 1e9
+            State = self.ReadState()
+            Bucket,Limit = self.Refill(State,Provider,Now)
+            if Bucket.get("blocked",0) > Now:
+                WaitSeconds = Bucket["blocked"] - Now
+            elif Bucket["tokens"] >= 1:
+                Bucket["tokens"] -= 1
+                WaitSeconds = 0
+            else:
+                WaitSeconds = (1 - Bucket["tokens"]) / Limit["Rate"]
+            # Bucket state lost in crash is harmless, no fsync on every request
+            AtomicFile.Write(self.StateFile,json.dumps(State),FileMode=0o600,Durable=False)
+            return WaitSeconds
+        try:
+            return self.Locked(Take)
+        # Limiter never block request when state can't be stored
+        except OSError as LimiterError:
+            a4zlog.warning(f"Rate limiter state not available |{LimiterError}")
+            return 0
+
+    # Waiting until token available
+    def Acquire(self,Provider):
+        while True:
+            WaitSeconds = self.TryAcquire(Provider)
+            if WaitSeconds <= 0:
+                return True
+            if WaitSeconds > 1:
+                a4zlog.info(f"Rate limit |{Provider} |Waiting {WaitSeconds:.1f} seconds")
+            sleep(min(WaitSeconds,self.WaitMax))
+
+    # Blocking provider after 429, honour Retry-After for every process
+    def Block(self,Provider,Seconds):
+        def Hold():
+            Now = time_ns() / 1e9
+            State = self.ReadState()
+            Bucket,_ = self.Refill(State,Provider,Now)
+            Bucket["blocked"] = max(Bucket.get("blocked",0),Now + Seconds)
+            Bucket["tokens"] = 0.0
+            AtomicFile.Write(self.StateFile,json.dumps(State),FileMode=0o600,Durable=False)
+        try:
+            self.Locked(Hold)
+        except OSError as LimiterError:
+            a4zlog.warning(f"Rate limiter state not available |{LimiterError}")
+
+# Atomic file write, temporary file in same folder then rename, fsync skipped for disposable state
+class AtomicFile():
+    @staticmethod
+    def Write(FilePath,FileContent,FileMode=0o644,Durable=True):
+        FilePath = Path(FilePath)
+        FilePath.parent.mkdir(parents=True,exist_ok=True)
+        if isinstance(FileContent,str):
+            FileContent = FileContent.encode("utf-8")
+        TempFD,TempPath = tempfile.mkstemp(prefix=f".{FilePath.name}.",dir=str(FilePath.parent))
+        try:
+            with os.fdopen(TempFD,"wb") as TempFile:
+                TempFile.write(FileContent)
+                if Durable:
+                    TempFile.flush()
+                    os.fsync(TempFile.fileno())
+            os.chmod(TempPath,FileMode)
+            os.replace(TempPath,FilePath)
+        except BaseException:
+            Path(TempPath).unlink(missing_ok=True)
+            raise
+        if not Durable:
+            return FilePath
+        # Persist rename, not supported on every platform
+        try:
+            FolderFD = os.open(str(FilePath.parent),os.O_RDONLY)
+            try:
+                os.fsync(FolderFD)
+            finally:
+                os.close(FolderFD)
+        except OSError:
+            pass
+        return FilePath
+
+# Private key algorithm, RSA or ECDSA
+class KeyAlgorithm():
+    # Key type name, algorithm and size or curve
+    KeyTypes = {
+        "RSA2048":("RSA",2048),
+        "RSA3072":("RSA",3072),
+        "RSA4096":("RSA",4096),
+        "P256":("EC","P-256"),
+        "P384":("EC","P-384")}
+
+    # Normalize key type name, unknown type raise error
+    @classmethod
+    def Check(cls,KeyType=None):
+        KeyTypeName = str(KeyType or "RSA2048").upper().replace("-","").replace("_","").replace("ECDSA","")
+        if KeyTypeName not in cls.KeyTypes:
+            raise ValueError(f"Unsupported key type |{KeyType}")
+        return KeyTypeName
+
+    # OpenSSL req command key option
+    @classmethod
+    def OpenSSLArgs(cls,KeyType=None):
+        Algorithm,KeyParameter = cls.KeyTypes[cls.Check(KeyType)]
+        if Algorithm == "RSA":
+            return ["-newkey",f"rsa:{KeyParameter}"]
+        return ["-newkey","ec","-pkeyopt",f"ec_paramgen_curve:{KeyParameter}"]
+
+    # RSA key bits, None for ECDSA
+    @classmethod
+    def RSABits(cls,KeyType=None):
+        Algorithm,KeyParameter = cls.KeyTypes[cls.Check(KeyType)]
+        return KeyParameter if Algorithm == "RSA" else None
+
+    # Generate private key in-process, cryptography package required
+    @classmethod
+    def Generate(cls,KeyType=None):
+        from cryptography.hazmat.primitives.asymmetric import rsa,ec
+        Algorithm,KeyParameter = cls.KeyTypes[cls.Check(KeyType)]
+        if Algorithm == "RSA":
+            return rsa.generate_private_key(public_exponent=65537,key_size=KeyParameter)
+        Curve = ec.SECP256R1() if KeyParameter == "P-256" else ec.SECP384R1()
+        return ec.generate_private_key(Curve)
+
+# Certificate expires from PEM file, minimal DER reader memoized by file identity
+class CertificateExpires():
+    # Certificate path as key, value is (file identity, notAfter)
+    Entries = {}
+    Lock    = threading.Lock()
+
+    # DER tag, content start and content end
+    @staticmethod
+    def ReadTLV(CertificateDER,Offset):
+        Tag = CertificateDER[Offset]
+        Length = CertificateDER[Offset + 1]
+        Offset += 2
+        if Length & 0x80:
+            LengthBytes = Length & 0x7F
+            Length = int.from_bytes(CertificateDER[Offset:Offset + LengthBytes],"big")
+            Offset += LengthBytes
+        return Tag,Offset,Offset + Length
+
+    # First certificate in PEM as DER
+    @staticmethod
+    def DER(CertificatePEM):
+        if isinstance(CertificatePEM,bytes):
+            CertificatePEM = CertificatePEM.decode("ascii","ignore")
+        PEMBegin = CertificatePEM.index("-----BEGIN CERTIFICATE-----") + len("-----BEGIN CERTIFICATE-----")
+        PEMEnd = CertificatePEM.index("-----END CERTIFICATE-----",PEMBegin)
+        return base64.b64decode("".join(CertificatePEM[PEMBegin:PEMEnd].split()))
+
+    # First certificate SHA-256 fingerprint, None when not a certificate
+    @classmethod
+    def Fingerprint(cls,CertificatePEM):
+        try:
+            return hashlib.sha256(cls.DER(CertificatePEM)).hexdigest().upper()
+        except (ValueError,TypeError):
+            return None
+
+    # First certificate notAfter as UTC datetime
+    @classmethod
+    def NotAfter(cls,CertificatePEM):
+        CertificateDER = cls.DER(CertificatePEM)
+        # Certificate and tbsCertificate sequence
+        _,CertificateStart,_ = cls.ReadTLV(CertificateDER,0)
+        _,Offset,_ = cls.ReadTLV(CertificateDER,CertificateStart)
+        # Optional explicit version
+        Tag,_,FieldEnd = cls.ReadTLV(CertificateDER,Offset)
+        if Tag == 0xA0:
+            Offset = FieldEnd
+        # Skip serial number, signature algorithm and issuer
+        for _ in range(3):
+            _,_,Offset = cls.ReadTLV(CertificateDER,Offset)
+        # Validity sequence, notBefore then notAfter
+        _,ValidityStart,_ = cls.ReadTLV(CertificateDER,Offset)
+        _,_,NotBeforeEnd = cls.ReadTLV(CertificateDER,ValidityStart)
+        Tag,NotAfterStart,NotAfterEnd = cls.ReadTLV(CertificateDER,NotBeforeEnd)
+        NotAfterText = CertificateDER[NotAfterStart:NotAfterEnd].decode("ascii").rstrip("Z")
+        # UTCTime two digits year, GeneralizedTime four digits year
+        if Tag == 0x17:
+            NotAfterYear = int(NotAfterText[:2])
+            NotAfterText = ("19" if NotAfterYear >= 50 else "20") + NotAfterText
+        elif Tag != 0x18:
+            raise ValueError(f"Unknown certificate time tag |{Tag}")
+        return datetime.datetime.strptime(NotAfterText[:14],"%Y%m%d%H%M%S").replace(tzinfo=datetime.timezone.utc)
+
+    # Installed certificate notAfter, None when missing or unreadable
+    @classmethod
+    def Load(cls,CertificatePath):
+        try:
+            CertificatePath = str(CertificatePath)
+            CertificateStat = os.stat(CertificatePath)
+            FileIdentity = (CertificateStat.st_ino,CertificateStat.st_mtime_ns,CertificateStat.st_size)
+            CacheEntry = cls.Entries.get(CertificatePath)
+            if CacheEntry is not None and CacheEntry[0] == FileIdentity:
+                return CacheEntry[1]
+            with open(CertificatePath,"rb") as CertificateFile:
+                NotAfter = cls.NotAfter(CertificateFile.read())
+            with cls.Lock:
+                cls.Entries[CertificatePath] = (FileIdentity,NotAfter)
+            return NotAfter
+        except FileNotFoundError:
+            return None
+        except Exception as CertificateExpiresError:
+            a4zlog.warning(f"Unable read installed certificate expires |{CertificateExpiresError}")
+            return None
+
+# API error, provider with HTTP status or API error detail, also caught as RuntimeError
+class APIError(RuntimeError):
+    def __init__(self,Provider,Status=None,Detail=None,Message=None):
+        self.Provider = Provider
+        self.Status   = Status
+        self.Detail   = Detail
+        ErrorText = f"{Provider} API |HTTP {Status}" if Detail is None else f"{Provider} API |{Detail}"
+        super().__init__(f"{Message} |{ErrorText}" if Message else ErrorText)
+
+    # Last API error of client with message, plain RuntimeError when no API error recorded
+    @classmethod
+    def From(cls,Client,Message):
+        LastError = getattr(Client,"LastError",None)
+        if isinstance(LastError,cls):
+            return cls(LastError.Provider,LastError.Status,LastError.Detail,Message)
+        return RuntimeError(Message)
+
+# API client base, last error kept per thread, shared client not mixing errors of other threads
+class APIClient():
+    @property
+    def LastError(self):
+        return getattr(self.__dict__.setdefault("Errors",threading.local()),"Error",None)
+
+    @LastError.setter
+    def LastError(self,Error):
+        self.__dict__.setdefault("Errors",threading.local()).Error = Error
+
+# Response model base, fixed slots, read by attribute
+class ResponseModel():
+    __slots__ = ()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{Key}={getattr(self,Key)!r}' for Key in self.__slots__ if not Key.startswith('_'))})"
+
+# ZeroSSL validation record of single domain
+class ValidationRecord(ResponseModel):
+    __slots__ = ("domain","cname","value","url","content")
+
+    def __init__(self,domain,cname="",value="",url="",content=""):
+        self.domain  = domain
+        self.cname   = cname
+        self.value   = value
+        self.url     = url
+        self.content = content
+
+    # Parsing other_methods entry of domain
+    @classmethod
+    def FromDict(cls,Domain,DomainMethods):
+        return cls(Domain,DomainMethods.get("cname_validation_p1",""),DomainMethods.get("cname_validation_p2",""),
+                   DomainMethods.get("file_validation_url_https",""),DomainMethods.get("file_validation_content",""))
+
+    # Same keys as ZeroSSL other_methods entry
+    def ToDict(self):
+        return {"cname_validation_p1":self.cname,"cname_validation_p2":self.value,
+                "file_validation_url_https":self.url,"file_validation_content":self.content}
+
+# ZeroSSL certificate, fields used by reuse, mirror and bulk operation only
+class CertificateInfo(ResponseModel):
+    __slots__ = ("id","status","common_name","additional_domains","created","expires","records")
+
+    def __init__(self,id,status=None,common_name="",additional_domains="",created="",expires="",records=()):
+        self.id                 = id
+        self.status             = status
+        self.common_name        = common_name
+        self.additional_domains = additional_domains
+        self.created            = created
+        self.expires            = expires
+        self.records            = tuple(records)
+
+    # Parsing ZeroSSL certificate object, model passed through
+    @classmethod
+    def FromDict(cls,Certificate):
+        if isinstance(Certificate,cls):
+            return Certificate
+        OtherMethods = (Certificate.get("validation") or {}).get("other_methods") or {}
+        return cls(Certificate.get("id"),Certificate.get("status"),Certificate.get("common_name") or "",
+                   Certificate.get("additional_domains") or "",Certificate.get("created") or "",Certificate.get("expires") or "",
+                   (ValidationRecord.FromDict(Domain,DomainMethods) for Domain,DomainMethods in OtherMethods.items() if isinstance(DomainMethods,dict)))
+
+    # Certificate domains, common name first
+    @property
+    def Domains(self):
+        AdditionalDomains = [Domain.strip() for Domain in str(self.additional_domains).split(",") if Domain.strip()]
+        return [self.common_name,*AdditionalDomains] if self.common_name else AdditionalDomains
+
+    # Same structure as ZeroSSL certificate object, without unused fields
+    def ToDict(self):
+        Certificate = {"id":self.id,"status":self.status,"common_name":self.common_name,"additional_domains":self.additional_domains,
+                       "created":self.created,"expires":self.expires}
+        if self.records:
+            Certificate["validation"] = {"other_methods":{Record.domain:Record.ToDict() for Record in self.records}}
+        return Certificate
+
+# Cloudflare DNS record, fields used by records index and update
+class DNSRecord(ResponseModel):
+    __slots__ = ("id","name","type","content","proxied","ttl")
+
+    def __init__(self,id,name,type,content="",proxied=False,ttl=1):
+        self.id      = id
+        self.name    = name
+        self.type    = type
+        self.content = content
+        self.proxied = proxied
+        self.ttl     = ttl
+
+    # Parsing Cloudflare DNS record object
+    @classmethod
+    def FromDict(cls,Record):
+        if isinstance(Record,cls):
+            return Record
+        return cls(Record.get("id"),Record.get("name"),Record.get("type"),Record.get("content") or "",
+                   bool(Record.get("proxied")),Record.get("ttl",1))
+
+    # Records index entry
+    def IndexEntry(self):
+        return {"id":self.id,"content":self.content}
+
+    def ToDict(self):
+        return {"id":self.id,"name":self.name,"type":self.type,"content":self.content,"proxied":self.proxied,"ttl":self.ttl}
+
+# cPanel installed host certificate, PEM body decoded only when needed
+class InstalledHost(ResponseModel):
+    __slots__ = ("servername","domains","not_after","issuer","certificate","_fingerprint")
+
+    def __init__(self,servername,domains=(),not_after=None,issuer="",certificate=""):
+        self.servername   = servername
+        self.domains      = tuple(domains)
+        self.not_after    = not_after
+        self.issuer       = issuer
+        self.certificate  = certificate
+        self._fingerprint = None
+
+    # Parsing SSL/installed_host data, notAfter read from PEM when UAPI not return it
+    @classmethod
+    def FromDict(cls,HostData):
+        CertificateData = HostData.get("certificate") or {}
+        return cls(HostData.get("servername") or "",CertificateData.get("domains") or (),CertificateData.get("not_after"),
+                   CertificateData.get("issuer.organizationName") or CertificateData.get("issuer.commonName") or "",
+                   HostData.get("certificate_text") or "")
+
+    # Certificate expires as UTC datetime, None when unknown
+    @property
+    def Expires(self):
+        if self.not_after is not None:
+            return datetime.datetime.fromtimestamp(int(self.not_after),tz=datetime.timezone.utc)
+        if self.certificate:
+            try:
+                self.not_after = int(CertificateExpires.NotAfter(self.certificate).timestamp())
+                return self.Expires
+            except (ValueError,IndexError):
+                return None
+        return None
+
+    # SHA-256 fingerprint of installed certificate, decoded once
+    @property
+    def Fingerprint(self):
+        if self._fingerprint is None and self.certificate:
+            self._fingerprint = CertificateExpires.Fingerprint(self.certificate)
+        return self._fingerprint
+
+    # Remain days of installed certificate, None when unknown
+    def RemainDays(self):
+        ExpiresTime = self.Expires
+        if ExpiresTime is None:
+            return None
+        return (ExpiresTime - datetime.datetime.now(tz=datetime.timezone.utc)).days
+
+# Process-wide configuration registry, parse each file once and reload when file changed
+class ConfigurationRegistry():
+    def __init__(self):
+        self.Lock    = threading.Lock()
+        # Resolved path as key, value is ((mtime, size), frozen configuration)
+        self.Entries = {}
+
+    # Read-only view, nested dictionary as mapping proxy and list as tuple
+    @staticmethod
+    def Freeze(ConfigContent):
+        if isinstance(ConfigContent,dict):
+            return MappingProxyType({Key:ConfigurationRegistry.Freeze(Value) for Key,Value in ConfigContent.items()})
+        elif isinstance(ConfigContent,list):
+            return tuple(ConfigurationRegistry.Freeze(Value) for Value in ConfigContent)
+        return ConfigContent
+
+    # Writable copy of read-only view
+    @staticmethod
+    def Thaw(ConfigContent):
+        if isinstance(ConfigContent,Mapping):
+            return {Key:ConfigurationRegistry.Thaw(Value) for Key,Value in ConfigContent.items()}
+        elif isinstance(ConfigContent,(list,tuple)):
+            return [ConfigurationRegistry.Thaw(Value) for Value in ConfigContent]
+        return ConfigContent
+
+    # Load configuration file, parsing only when mtime or size changed
+    def Load(self,ConfigFilePath):
+        ConfigFilePath = Path(ConfigFilePath).resolve()
+        ConfigStat = ConfigFilePath.stat()
+        FileSignature = (ConfigStat.st_mtime_ns,ConfigStat.st_size)
+        with self.Lock:
+            CacheEntry = self.Entries.get(ConfigFilePath)
+            if CacheEntry is not None and CacheEntry[0] == FileSignature:
+                return CacheEntry[1]
+            with ConfigFilePath.open("r",encoding="utf-8") as ConfigContent:
+                FrozenConfig = self.Freeze(json.load(ConfigContent))
+            self.Entries[ConfigFilePath] = (FileSignature,FrozenConfig)
+            return FrozenConfig
+
+    # Drop cached configuration, all files when path is empty
+    def Invalidate(self,ConfigFilePath=None):
+        with self.Lock:
+            if ConfigFilePath is None:
+                self.Entries.clear()
+            else:
+                self.Entries.pop(Path(ConfigFilePath).resolve(),None)
+
+# Shared registry
+ConfigRegistry = ConfigurationRegistry()
+
 # Configuration function, reading json file
 class Configuration():
     def __init__(self,ConfigFile):
         try:
             # Dictionary
-            if isinstance(ConfigFile,dict):
+            if isinstance(ConfigFile,Mapping):
                 self.Load = ConfigFile
                 return
-            if isinstance(ConfigFile,str):
+            if isinstance(ConfigFile,(str,Path)):
                 # Script config path
                 ConfigFilePath = Path(ConfigFile)
                 # Local path
                 LocFolderPath = Path(__file__).resolve().parent
                 # Local path with config name input
                 LocConfig = LocFolderPath / ConfigFilePath.name
-                # Read configuration
+                # Read configuration from registry
                 try:
-                    with ConfigFilePath.open("r",encoding="utf-8") as ConfigContent:
-                        self.Load = json.load(ConfigContent)
+                    self.Load = ConfigRegistry.Load(ConfigFilePath)
                 # Try to find configuration file at local folder
                 except FileNotFoundError:
-                    with LocConfig.open("r",encoding="utf-8") as ConfigContent:
-                        self.Load = json.load(ConfigContent)
+                    self.Load = ConfigRegistry.Load(LocConfig)
         # Error
         except Exception as ReadConfigError:
             a4zlog.exception(f"Unable reading configuration |{ReadConfigError}")
             raise
-        # QC 2026C06
+
+    # Path with suffix before extension
+    @staticmethod
+    def SuffixPath(FilePath,Suffix):
+        FilePath = Path(FilePath)
+        return str(FilePath.with_name(f"{FilePath.stem}.{Suffix}{FilePath.suffix}"))
+
+    # Certificate variants, primary and optional dual key certificate, False when dual config invalid
+    def Variants(self):
+        ConfigVariants = [self.Load]
+        DualConfig = self.Load.get("Certificate",{}).get("Dual")
+        if not DualConfig:
+            return ConfigVariants
+        if not isinstance(DualConfig,Mapping):
+            a4zlog.error(f"Dual certificate config must be object |{DualConfig}")
+            return False
+        VariantConfig = ConfigurationRegistry.Thaw(self.Load)
+        PrimaryCertificate = VariantConfig['Certificate']
+        VariantCertificate = VariantConfig['Certificate'] = {ConfigKey:ConfigValue for ConfigKey,ConfigValue in PrimaryCertificate.items() if ConfigKey != "Dual"}
+        # Cache file must be separated, default is suffix of primary cache
+        PrimaryCache = VariantConfig['ZeroSSLAPI']['Cache']
+        VariantConfig['ZeroSSLAPI']['Cache'] = DualConfig.get("Cache") or self.SuffixPath(PrimaryCache,"dual")
+        # Per certificate files, default is primary path with key type suffix
+        VariantSuffix = str(DualConfig.get("KeyType") or "dual").lower()
+        for ConfigKey in ("Config","CSR","PendingPK","PK","CA","CAB"):
+            if PrimaryCertificate.get(ConfigKey):
+                VariantCertificate[ConfigKey] = self.SuffixPath(PrimaryCertificate[ConfigKey],VariantSuffix)
+        VariantOutputs = {}
+        for OutputName,OutputConfig in (PrimaryCertificate.get("Outputs") or {}).items():
+            if isinstance(OutputConfig,Mapping) and OutputConfig.get("Path"):
+                VariantOutputs[OutputName] = dict(OutputConfig,Path=self.SuffixPath(OutputConfig["Path"],VariantSuffix))
+            elif OutputConfig:
+                VariantOutputs[OutputName] = self.SuffixPath(OutputConfig,VariantSuffix)
+        if VariantOutputs:
+            VariantCertificate['Outputs'] = VariantOutputs
+        if (PrimaryCertificate.get("Versioned") or {}).get("Folder"):
+            VariantCertificate['Versioned'] = dict(PrimaryCertificate['Versioned'],Folder=f"{PrimaryCertificate['Versioned']['Folder'].rstrip('/')}.{VariantSuffix}")
+        for ConfigKey,ConfigValue in DualConfig.items():
+            if ConfigKey != "Cache":
+                VariantCertificate[ConfigKey] = ConfigurationRegistry.Thaw(ConfigValue)
+        # Explicit path same as primary, variants would overwrite each other
+        if VariantConfig['ZeroSSLAPI']['Cache'] == PrimaryCache:
+            a4zlog.error("Dual certificate path same as primary certificate |Cache")
+            return False
+        for ConfigKey in ("Config","CSR","PendingPK","PK","CA","CAB"):
+            if PrimaryCertificate.get(ConfigKey) and VariantCertificate.get(ConfigKey) == PrimaryCertificate[ConfigKey]:
+                a4zlog.error(f"Dual certificate path same as primary certificate |{ConfigKey}")
+                return False
+        ConfigVariants.append(ConfigurationRegistry.Freeze(VariantConfig))
+        return ConfigVariants
+
+# Renewal window, deterministic per domain jitter and fleet-wide hourly cap
+class RenewalWindow():
+    def __init__(self,ConfigFile):
+        try:
+            self.WindowConfig = Configuration(ConfigFile).Load.get("RenewalWindow") or {}
+            # Renewal spread over days before minimum, zero is disabled
+            self.Days         = float(self.WindowConfig.get("Days",0))
+            # Renewals per hour for whole fleet, zero is unlimited
+            self.PerHour      = int(self.WindowConfig.get("PerHour",0))
+            self.StateFile    = Path(self.WindowConfig.get("StateFile") or Path(tempfile.gettempdir(),"acme4zerossl.window.json"))
+            self.Lock         = StateLock(self.StateFile)
+        except Exception as WindowInitialError:
+            a4zlog.exception(f"RenewalWindow__init__ |{WindowInitialError}")
+            raise
+
+    # Jitter seconds, same domain always same offset
+    def Offset(self,Domain):
+        if self.Days <= 0:
+            return 0
+        DomainHash = int.from_bytes(hashlib.sha256(str(Domain).lower().encode("utf-8")).digest()[:8],"big")
+        return DomainHash % int(self.Days * 86400)
+
+    # Renewal due time, between minimum and minimum plus window days before expires
+    def DueTime(self,Domain,ExpiresTime,Minimum=14):
+        return ExpiresTime - datetime.timedelta(days=Minimum,seconds=self.Offset(Domain))
+
+    # Renewal timestamps in last hour
+    def ReadState(self,Now):
+        try:
+            with open(self.StateFile,"r",encoding="utf-8") as StateContent:
+                RenewTimes = json.load(StateContent).get("renewals",[])
+        except (OSError,ValueError,AttributeError):
+            RenewTimes = []
+        return [RenewTime for RenewTime in RenewTimes if isinstance(RenewTime,(int,float)) and Now - RenewTime < 3600]
+
+    # Next free slot when hourly cap reached
+    def NextSlot(self):
+        Now = time_ns() / 1e9
+        if self.PerHour <= 0:
+            return Now
+        try:
+            RenewTimes = sorted(self.Lock.Run(lambda: self.ReadState(Now)))
+        except OSError:
+            return Now
+        if len(RenewTimes) < self.PerHour:
+            return Now
+        return RenewTimes[len(RenewTimes) - self.PerHour] + 3600
+
+    # Renewal admission, due and hourly cap not reached, minimum days always admitted
+    def Admit(self,Domain,ExpiresTime,Minimum=14):
+        CurrentTime = datetime.datetime.now(tz=datetime.timezone.utc)
+        # Same day rounding as expires check
+        Forced = (ExpiresTime - CurrentTime).days <= Minimum
+        if not Forced and CurrentTime < self.DueTime(Domain,ExpiresTime,Minimum):
+            return False
+        if self.PerHour <= 0:
+            return True
+        def Take():
+            Now = time_ns() / 1e9
+            RenewTimes = self.ReadState(Now)
+            if len(RenewTimes) >= self.PerHour and not Forced:
+                return False
+            RenewTimes.append(Now)
+            AtomicFile.Write(self.StateFile,json.dumps({"renewals":RenewTimes}),FileMode=0o600)
+            return True
+        try:
+            Admitted = self.Lock.Run(Take)
+        # Cap never block renewal when state can't be stored
+        except OSError as WindowError:
+            a4zlog.warning(f"Renewal window state not available |{WindowError}")
+            return True
+        if not Admitted:
+            a4zlog.info(f"Renewal deferred, hourly cap reached |{Domain}")
+        return Admitted
+
+# Pre-generated private key pool, one folder per key type
+class KeyPool():
+    def __init__(self,ConfigFile):
+        try:
+            self.KeyPoolConfig = Configuration(ConfigFile).Load['Certificate'].get("KeyPool") or {}
+            self.Folder        = Path(self.KeyPoolConfig.get("Folder") or ".")
+            # Target ready keys per key type, and background workers
+            self.Depth         = int(self.KeyPoolConfig.get("Depth",4))
+            self.Workers       = int(self.KeyPoolConfig.get("Workers",2))
+            self.UsageFile     = self.Folder / "usage.json"
+            self.Lock          = threading.Lock()
+            self.Executor      = None
+            self.Pending       = {}
+        except Exception as KeyPoolInitialError:
+            a4zlog.exception(f"KeyPool__init__ |{KeyPoolInitialError}")
+            raise
+
+    # Key pool disabled without folder
+    def Enabled(self):
+        return bool(self.KeyPoolConfig.get("Folder"))
+
+    # Key type folder, owner only
+    def KeyFolder(self,KeyType):
+        KeyFolderPath = self.Folder / KeyAlgorithm.Check(KeyType)
+        KeyFolderPath.mkdir(mode=0o700,parents=True,exist_ok=True)
+        os.chmod(self.Folder,0o700)
+        os.chmod(KeyFolderPath,0o700)
+        return KeyFolderPath
+
+    # Ready keys, temporary file of pending write excluded
+    def ReadyKeys(self,KeyType):
+        return [ReadyKey for ReadyKey in self.KeyFolder(KeyType).glob("*.pem") if not ReadyKey.name.startswith(".")]
+
+    # Ready keys count
+    def Ready(self,KeyType):
+        return len(self.ReadyKeys(KeyType))
+
+    # Claimed keys folder, outside ready keys
+    def ClaimFolder(self,KeyType):
+        ClaimFolderPath = self.KeyFolder(KeyType) / "claimed"
+        ClaimFolderPath.mkdir(mode=0o700,exist_ok=True)
+        return ClaimFolderPath
+
+    # Remove claimed keys left by crashed process, never handed out again
+    def CleanClaims(self,KeyType):
+        for ClaimedKey in self.ClaimFolder(KeyType).iterdir():
+            try:
+                os.kill(int(ClaimedKey.name.split(".",1)[0]),0)
+                continue
+            except (ProcessLookupError,ValueError):
+                pass
+            except PermissionError:
+                continue
+            a4zlog.info(f"Remove stale claimed key |{ClaimedKey.name}")
+            ClaimedKey.unlink(missing_ok=True)
+
+    # Usage accounting, taken, missed and generated keys
+    def Account(self,KeyType,Counter):
+        with self.Lock:
+            try:
+                with self.UsageFile.open("r",encoding="utf-8") as UsageContent:
+                    UsageData = json.load(UsageContent)
+            except (FileNotFoundError,ValueError):
+                UsageData = {}
+            KeyUsage = UsageData.setdefault(KeyAlgorithm.Check(KeyType),{"taken":0,"missed":0,"generated":0})
+            KeyUsage[Counter] = KeyUsage.get(Counter,0) + 1
+            KeyUsage["updated"] = datetime.datetime.now(tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+            AtomicFile.Write(self.UsageFile,json.dumps(UsageData,indent=4),0o600)
+
+    # Take ready key as PEM bytes, None when pool is empty
+    def Take(self,KeyType):
+        try:
+            ClaimFolderPath = self.ClaimFolder(KeyType)
+            for ReadyKey in self.ReadyKeys(KeyType):
+                # Claim by rename into claimed folder, other process may take same key
+                ClaimedKey = ClaimFolderPath / f"{os.getpid()}.{threading.get_ident()}.{ReadyKey.stem}.claimed"
+                try:
+                    os.rename(ReadyKey,ClaimedKey)
+                except FileNotFoundError:
+                    continue
+                with ClaimedKey.open("rb") as ClaimedKeyContent:
+                    PrivateKeyPEM = ClaimedKeyContent.read()
+                ClaimedKey.unlink()
+                self.Account(KeyType,"taken")
+                return PrivateKeyPEM
+            self.Account(KeyType,"missed")
+            return None
+        except Exception as KeyPoolTakeError:
+            a4zlog.exception(f"Error occurred during take key from pool |{KeyPoolTakeError}")
+            return None
+
+    # Generate single key into pool
+    def Generate(self,KeyType):
+        from cryptography.hazmat.primitives import serialization
+        PrivateKey = KeyAlgorithm.Generate(KeyType)
+        PrivateKeyPEM = PrivateKey.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption())
+        KeyFileName = f"{time_ns()}.{os.getpid()}.{random.getrandbits(32):08x}.pem"
+        AtomicFile.Write(self.KeyFolder(KeyType) / KeyFileName,PrivateKeyPEM,0o600)
+        self.Account(KeyType,"generated")
+        return KeyFileName
+
+    # Refill pool up to depth in background workers, wait is optional
+    def Refill(self,KeyType,Wait=False):
+        try:
+            KeyType = KeyAlgorithm.Check(KeyType)
+            self.CleanClaims(KeyType)
+            with self.Lock:
+                if self.Executor is None:
+                    self.Executor = ThreadPoolExecutor(max_workers=self.Workers,thread_name_prefix="KeyPool")
+                # Count generating keys, avoid over refill
+                PendingJobs = [PendingJob for PendingJob in self.Pending.get(KeyType,[]) if not PendingJob.done()]
+                RefillCount = self.Depth - self.Ready(KeyType) - len(PendingJobs)
+                for _ in range(max(RefillCount,0)):
+                    PendingJobs.append(self.Executor.submit(self.Generate,KeyType))
+                self.Pending[KeyType] = PendingJobs
+            if Wait:
+                for PendingJob in PendingJobs:
+                    PendingJob.result()
+            return max(RefillCount,0)
+        except Exception as KeyPoolRefillError:
+            a4zlog.exception(f"Error occurred during refill key pool |{KeyPoolRefillError}")
+            return False
+
+    # Pool status, ready keys and usage accounting
+    def Stats(self):
+        try:
+            with self.UsageFile.open("r",encoding="utf-8") as UsageContent:
+                UsageData = json.load(UsageContent)
+        except (FileNotFoundError,ValueError):
+            UsageData = {}
+        PoolStats = {}
+        for KeyType in KeyAlgorithm.KeyTypes:
+            if (self.Folder / KeyType).is_dir() or KeyType in UsageData:
+                PoolStats[KeyType] = dict(UsageData.get(KeyType,{}),ready=self.Ready(KeyType),depth=self.Depth)
+        return PoolStats
 
 # Runtime package
 class Runtime():
@@ -61,18 +967,34 @@ class Runtime():
             self.CertificateBA = self.RuntimeConfig['Certificate']['CAB']
             # File path for HTTP/HTTPS file validation
             self.Fileverify    = self.RuntimeConfig['FileChallenge']['HTMLFilePath']
+            # Optional local base URL for challenge file preflight check
+            self.PreflightURL  = self.RuntimeConfig['FileChallenge'].get("PreflightURL","")
             # CSR config
             self.Country       = self.RuntimeConfig['Certificate']['Country']
             self.State         = self.RuntimeConfig['Certificate']['StateOrProvince']
             self.Locality      = self.RuntimeConfig['Certificate']['Locality']
             self.Organization  = self.RuntimeConfig['Certificate']['Organization']
             self.Unit          = self.RuntimeConfig['Certificate']['OrganizationalUnit']
+            # Private key algorithm, default is RSA 2048
+            self.KeyType       = KeyAlgorithm.Check(self.RuntimeConfig['Certificate'].get("KeyType"))
+            # Pre-generated private key pool, optional
+            self.Keys          = KeyPool(self.RuntimeConfig)
+            # Deployment artifacts, fullchain, combined, PKCS#12 and JKS, optional
+            self.Outputs       = self.RuntimeConfig['Certificate'].get("Outputs") or {}
+            # Versioned install folder swapped by symlink, optional
+            self.Versioned     = self.RuntimeConfig['Certificate'].get("Versioned") or {}
+            # Renewal window policy, optional
+            self.Window        = RenewalWindow(self.RuntimeConfig)
             # Domains list
             self.DomainList    = self.RuntimeConfig['Certificate']['Domains']
             self.CommonName    = self.DomainList[0] if len(self.DomainList) > 0 else ""
             self.AltName       = self.DomainList[1] if len(self.DomainList) > 1 else ""
+            # All subject alternative names, common name first
+            self.Domains       = [Domain for Domain in self.DomainList if isinstance(Domain,str) and Domain.strip()]
             # Terminal text width
             self.MessageWidth  = 100
+            # Shared HTTP transport
+            self.Http          = Transport.Shared(self.RuntimeConfig)
         # Class initial error
         except Exception as RuntimeInitialError:
             a4zlog.exception(f"Runtime_Initialization_Error |{RuntimeInitialError}")
@@ -95,8 +1017,12 @@ class Runtime():
             a4zlog.warning(f"Unable printout runtime |{RuntimeMessagePrintError}")
         # QC 2026B11
 
-    # Check certificate expires, default minimum is 14 days
-    def ExpiresCheck(self,Minimum=14):
+    # Certificate expires, installed certificate first and ZeroSSL cache as fallback
+    def ExpiresDate(self):
+        # Installed certificate, no network access
+        ExpiresTime = CertificateExpires.Load(self.Certificate) if self.Certificate else None
+        if ExpiresTime is not None:
+            return ExpiresTime
         # Load config for cache path
         CacheFilePath = Path(self.Cache)
         # Read cache get certificate expires
@@ -107,40 +1033,219 @@ class Runtime():
         except FileNotFoundError:
             a4zlog.info("ZeroSSL cache file not found, assume an initialization situation")
             return None
-        # Get expires
+        # Translate cache file certificate expires string into time format
+        try:
+            return datetime.datetime.strptime(CacheData.get("expires"),"%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+        except Exception as ExpiresDateError:
+            a4zlog.warning(f"Unable check certificate expires from cache |{ExpiresDateError}")
+            return None
+
+    # Check certificate expires, default minimum is 14 days
+    def ExpiresCheck(self,Minimum=14):
         try:
-            # Translate cache file certificate expires string into time format
-            ExpiresTime = datetime.datetime.strptime(CacheData.get("expires"),"%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+            ExpiresTime = self.ExpiresDate()
+            # Certificate not found, renewed
+            if ExpiresTime is None:
+                return None
             # Currently time
             CurrentTime = datetime.datetime.now(tz=datetime.timezone.utc)
             # Calculate
             TimeDifference = ExpiresTime - CurrentTime
             # No need renewed
-            if TimeDifference.days > Minimum:
+            if TimeDifference.days > Minimum + self.Window.Days:
                 return TimeDifference.days
-            # Below minimum, renewed
-            elif TimeDifference.days <= Minimum:
+            # Inside renewal window, renewed when domain slot due and hourly cap not reached
+            elif self.Window.Admit(self.CommonName,ExpiresTime,Minimum):
                 return None
+            else:
+                return TimeDifference.days
         # Calculate error, force renewed
         except Exception as ExpiresCheckError:
             a4zlog.warning(f"Unable check certificate expires, force renewed |{ExpiresCheckError}")
             return None
-        # QC 2026E03
+
+    # Output config as mapping, path string or mapping with Path, None when not configured
+    def OutputConfig(self,OutputName):
+        OutputConfig = self.Outputs.get(OutputName)
+        if isinstance(OutputConfig,Mapping):
+            return OutputConfig if OutputConfig.get("Path") else None
+        return {"Path":OutputConfig} if OutputConfig else None
+
+    # Configured output, keystore output skipped when required package not found
+    def OutputEnabled(self,OutputName):
+        if self.OutputConfig(OutputName) is None:
+            return False
+        for ModuleName in {"PKCS12":("cryptography",),"JKS":("jks","cryptography")}.get(OutputName,()):
+            if importlib.util.find_spec(ModuleName) is None:
+                a4zlog.warning(f"{ModuleName} package not found, {OutputName} output skipped")
+                return False
+        return True
+
+    # Configured artifact paths, skipped output not included
+    def OutputPaths(self):
+        return [self.OutputConfig(OutputName)["Path"] for OutputName in ("Fullchain","Combined","PKCS12","JKS") if self.OutputEnabled(OutputName)]
+
+    # Deployment artifacts from downloaded payload, as install file list
+    def OutputFiles(self,CAString,CABString,PKString):
+        OutputFiles = []
+        if not self.Outputs:
+            return OutputFiles
+        if isinstance(PKString,bytes):
+            PKString = PKString.decode("ascii")
+        Fullchain = CAString.rstrip("\n") + "\n" + CABString.lstrip("\n")
+        Fullchain = Fullchain.rstrip("\n") + "\n"
+        # Leaf and bundle
+        if self.OutputEnabled("Fullchain"):
+            OutputFiles.append([self.OutputConfig("Fullchain")["Path"],Fullchain,0o644])
+        # Private key and fullchain, HAProxy
+        if self.OutputEnabled("Combined"):
+            OutputFiles.append([self.OutputConfig("Combined")["Path"],PKString.rstrip("\n") + "\n" + Fullchain,0o600])
+        # Keystore with password, Tomcat and Java
+        for OutputName,OutputBuilder in (("PKCS12",self.OutputPKCS12),("JKS",self.OutputJKS)):
+            if not self.OutputEnabled(OutputName):
+                continue
+            OutputConfig = self.OutputConfig(OutputName)
+            OutputContent = OutputBuilder(OutputConfig,CAString,CABString,PKString)
+            if OutputContent is not None:
+                OutputFiles.append([OutputConfig["Path"],OutputContent,0o600])
+        return OutputFiles
+
+    # PKCS#12 keystore, require cryptography
+    def OutputPKCS12(self,OutputConfig,CAString,CABString,PKString):
+        try:
+            from cryptography import x509
+            from cryptography.hazmat.primitives import serialization
+            from cryptography.hazmat.primitives.serialization import pkcs12
+        except ImportError:
+            a4zlog.error("cryptography package not found, PKCS#12 output skipped")
+            return None
+        PrivateKey = serialization.load_pem_private_key(PKString.encode("ascii"),password=None)
+        Password = str(OutputConfig.get("Password","")).encode("utf-8")
+        Encryption = serialization.BestAvailableEncryption(Password) if Password else serialization.NoEncryption()
+        return pkcs12.serialize_key_and_certificates(
+            str(OutputConfig.get("Alias") or self.CommonName).encode("utf-8"),
+            PrivateKey,
+            x509.load_pem_x509_certificate(CAString.encode("ascii")),
+            x509.load_pem_x509_certificates(CABString.encode("ascii")) if CABString.strip() else None,
+            Encryption)
+
+    # Java keystore, require cryptography and pyjks
+    def OutputJKS(self,OutputConfig,CAString,CABString,PKString):
+        try:
+            import jks
+            from cryptography import x509
+            from cryptography.hazmat.primitives import serialization
+        except ImportError:
+            a4zlog.error("pyjks or cryptography package not found, JKS output skipped")
+            return None
+        PrivateKey = serialization.load_pem_private_key(PKString.encode("ascii"),password=None)
+        PrivateKeyDER = PrivateKey.private_bytes(serialization.Encoding.DER,serialization.PrivateFormat.PKCS8,serialization.NoEncryption())
+        ChainDER = [x509.load_pem_x509_certificate(CAString.encode("ascii")).public_bytes(serialization.Encoding.DER)]
+        if CABString.strip():
+            ChainDER.extend(Certificate.public_bytes(serialization.Encoding.DER) for Certificate in x509.load_pem_x509_certificates(CABString.encode("ascii")))
+        KeyEntry = jks.PrivateKeyEntry.new(str(OutputConfig.get("Alias") or self.CommonName),ChainDER,PrivateKeyDER,"pkcs8")
+        return jks.KeyStore.new("jks",[KeyEntry]).saves(str(OutputConfig.get("Password","changeit")))
+
+    # Running server reload or restart command
+    @staticmethod
+    def ServerReload(ServerCommand):
+        ServerStatus = subprocess.Popen(ServerCommand,stdout=subprocess.PIPE,stderr=subprocess.PIPE,text=True)
+        # Discard output
+        stdout,stderr = ServerStatus.communicate()
+        if ServerStatus.returncode != 0:
+            a4zlog.error(f"Unable running server reload/restart command |{stdout} |{stderr}")
+            return False
+        return True
+
+    # Installed certificate has same fingerprint
+    def Installed(self,CertificatePEM):
+        NewFingerprint = CertificateExpires.Fingerprint(CertificatePEM)
+        if NewFingerprint is None or not Path(self.ActivePK).is_file():
+            return False
+        try:
+            with open(self.Certificate,"rb") as InstalledCertificate:
+                return CertificateExpires.Fingerprint(InstalledCertificate.read()) == NewFingerprint
+        except OSError:
+            return False
+
+    # Installed file mode, default when file not exists
+    @staticmethod
+    def FileMode(FilePath,DefaultMode):
+        try:
+            return os.stat(FilePath).st_mode & 0o777
+        except OSError:
+            return DefaultMode
+
+    # Install as new version folder, then swap current symlink
+    def InstallVersion(self,InstallFiles,CertificatePEM):
+        VersionRoot = Path(self.Versioned["Folder"])
+        CurrentLink = VersionRoot / "current"
+        VersionName = datetime.datetime.now(tz=datetime.timezone.utc).strftime("%Y%m%d%H%M%S") + f"-{(CertificateExpires.Fingerprint(CertificatePEM) or 'UNKNOWN')[:8]}"
+        VersionFolder = VersionRoot / "releases" / VersionName
+        # Path inside current folder kept, path outside placed by file name and written to configured path as well
+        CurrentPath = os.path.abspath(CurrentLink)
+        VersionFiles = {}
+        OutsideFiles = []
+        for InstallPath,InstallContent,InstallMode in InstallFiles:
+            InstallPath = os.path.abspath(InstallPath)
+            if InstallPath.startswith(CurrentPath + os.sep):
+                VersionFile = os.path.relpath(InstallPath,CurrentPath)
+            else:
+                VersionFile = os.path.basename(InstallPath)
+                OutsideFiles.append([InstallPath,InstallContent,InstallMode])
+            if VersionFile in VersionFiles:
+                raise ValueError(f"Versioned install file name conflict |{VersionFiles[VersionFile][0]} |{InstallPath}")
+            VersionFiles[VersionFile] = [InstallPath,InstallContent,InstallMode]
+        for VersionFile,(InstallPath,InstallContent,InstallMode) in VersionFiles.items():
+            AtomicFile.Write(VersionFolder / VersionFile,InstallContent,FileMode=self.FileMode(InstallPath,InstallMode))
+        # Symlink replaced by rename, server see old or new version only
+        TempLink = VersionRoot / f".current.{os.getpid()}"
+        TempLink.unlink(missing_ok=True)
+        os.symlink(os.path.join("releases",VersionName),TempLink)
+        os.replace(TempLink,CurrentLink)
+        # Configured path outside current folder, read by expires and unchanged check
+        for InstallPath,InstallContent,InstallMode in OutsideFiles:
+            AtomicFile.Write(InstallPath,InstallContent,FileMode=self.FileMode(InstallPath,InstallMode))
+        try:
+            FolderFD = os.open(str(VersionRoot),os.O_RDONLY)
+            try:
+                os.fsync(FolderFD)
+            finally:
+                os.close(FolderFD)
+        except OSError:
+            pass
+        self.PruneVersions(VersionName)
+        return VersionFolder
+
+    # Remove old versions, best effort after swap, failure only logged
+    def PruneVersions(self,VersionName):
+        VersionKeep = max(1,int(self.Versioned.get("Keep",3)))
+        ReleasesFolder = Path(self.Versioned["Folder"]) / "releases"
+        try:
+            OldVersions = sorted(ReleasesFolder.iterdir())[:-VersionKeep]
+        except OSError as PruneError:
+            a4zlog.warning(f"Unable list old certificate versions |{PruneError}")
+            return
+        for OldVersion in OldVersions:
+            if OldVersion.name == VersionName or not OldVersion.is_dir():
+                continue
+            try:
+                shutil.rmtree(OldVersion)
+            except OSError as PruneError:
+                a4zlog.warning(f"Unable remove old certificate version |{OldVersion} |{PruneError}")
 
     # Certificate Signing Request
     def CreateCSRConfig(self):
         try:
-            # Get main alternative names
-            AltNames1 = f"DNS.1 = {self.CommonName}"
-            # Setting second alternative names
-            AltNames2 = f"DNS.2 = {self.AltName}" if isinstance(self.AltName,str) and self.AltName.strip() else ""
+            # Alternative names, common name as first
+            AltNames = [f"DNS.{DomainIndex} = {Domain}" for DomainIndex,Domain in enumerate(self.Domains,1)]
             # Certificate common name, same as main alternative names
             DNconfig  = f"commonName = {self.CommonName}"
             # Certificate Signing Request contents
             CSRConfigContents = [
                 # Basic Config
                 "[req]",
-                "default_bits = 2048",
+                f"default_bits = {KeyAlgorithm.RSABits(self.KeyType)}" if KeyAlgorithm.RSABits(self.KeyType) else "",
                 "prompt = no",
                 "encrypt_key = no",
                 "default_md = sha256",
@@ -152,7 +1257,7 @@ class Runtime():
                 "[x509_v3_req]",
                 "subjectAltName = @alt_names",
                 "[alt_names]",
-                AltNames1,AltNames2,
+                *AltNames,
                 # Distinguished
                 "[req_distinguished_name]",
                 f"countryName = {self.Country}",
@@ -167,8 +1272,56 @@ class Runtime():
             return False
         # QC 2026B11
 
+    # Create certificates signing request and PK in-process, cryptography package required
+    def CreateCSRNative(self):
+        try:
+            from cryptography import x509
+            from cryptography.x509.oid import NameOID
+            from cryptography.hazmat.primitives import hashes,serialization
+        except ImportError:
+            a4zlog.info("cryptography package not found, using OpenSSL command")
+            return False
+        try:
+            # Ready key from pool, generate inline when pool is empty
+            PrivateKeyPEM = self.Keys.Take(self.KeyType) if self.Keys.Enabled() else None
+            if PrivateKeyPEM is not None:
+                PrivateKey = serialization.load_pem_private_key(PrivateKeyPEM,password=None)
+            else:
+                PrivateKey = KeyAlgorithm.Generate(self.KeyType)
+            if self.Keys.Enabled():
+                self.Keys.Refill(self.KeyType)
+            # Distinguished, skip empty field
+            DistinguishedFields = [
+                (NameOID.COUNTRY_NAME,self.Country),
+                (NameOID.STATE_OR_PROVINCE_NAME,self.State),
+                (NameOID.LOCALITY_NAME,self.Locality),
+                (NameOID.ORGANIZATION_NAME,self.Organization),
+                (NameOID.ORGANIZATIONAL_UNIT_NAME,self.Unit),
+                (NameOID.COMMON_NAME,self.CommonName)]
+            SubjectName = x509.Name([x509.NameAttribute(FieldOID,str(FieldValue)) for FieldOID,FieldValue in DistinguishedFields if str(FieldValue).strip()])
+            # Alternative names
+            AltNames = [x509.DNSName(Domain) for Domain in self.Domains]
+            CSRBuilder = x509.CertificateSigningRequestBuilder().subject_name(SubjectName)
+            CSRBuilder = CSRBuilder.add_extension(x509.SubjectAlternativeName(AltNames),critical=False)
+            CSRContent = CSRBuilder.sign(PrivateKey,hashes.SHA256())
+            # Write private key and CSR
+            PrivateKeyPEM = PrivateKey.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption())
+            AtomicFile.Write(self.PendingPK,PrivateKeyPEM,0o600)
+            AtomicFile.Write(self.CSROutput,CSRContent.public_bytes(serialization.Encoding.PEM))
+            return [self.PendingPK,self.CSROutput]
+        except Exception as CreateCSRNativeError:
+            a4zlog.warning(f"Unable create CSR in-process, using OpenSSL command |{CreateCSRNativeError}")
+            return False
+
     # Create certificates signing request and PK
     def CreateCSR(self):
+        # In-process generation, OpenSSL command as fallback
+        CSRNativeCheck = self.CreateCSRNative()
+        if isinstance(CSRNativeCheck,list):
+            return CSRNativeCheck
         try:
             CSRConfigContents = self.CreateCSRConfig()
             if not isinstance(CSRConfigContents,list):
@@ -184,7 +1337,7 @@ class Runtime():
                 for CSRConfigLine in filter(None,CSRConfigContents):
                     CSRSignConfig.write(CSRConfigLine+"\n")
             # OpenSSL generate command
-            OpensslCommand = ["openssl","req","-new","-nodes","-newkey","rsa:2048",
+            OpensslCommand = ["openssl","req","-new","-nodes",*KeyAlgorithm.OpenSSLArgs(self.KeyType),
                               "-keyout",f"{self.PendingPK}","-out",f"{self.CSROutput}","-config",f"{self.CSRConfigFile}"]
             # Using OpenSSL generate CSR and PK
             CsrStatus = subprocess.Popen(OpensslCommand,stdout=subprocess.PIPE,stderr=subprocess.PIPE,text=True)
@@ -241,6 +1394,58 @@ class Runtime():
             return False
         # QC 2026B11
 
+    # Fetch single challenge file, compare with expected content
+    def FetchValidationFile(self,VerifyRequestFile):
+        ValidationURL = VerifyRequestFile.get("url","")
+        RequestHeader = {}
+        # Local server, keep virtual host
+        if self.PreflightURL:
+            ValidationHost = ValidationURL.split("://",1)[-1].split("/",1)[0]
+            ValidationURL = self.PreflightURL.rstrip("/") + "/" + str(VerifyRequestFile.get("file","")).lstrip("/")
+            RequestHeader["Host"] = ValidationHost
+        ChallengeRespon = self.Http.Request("GET",ValidationURL,Retry=0,headers=RequestHeader,timeout=10)
+        if ChallengeRespon.status_code != 200:
+            return False
+        ChallengeTexts = VerifyRequestFile.get("content","")
+        if not isinstance(ChallengeTexts,list):
+            ChallengeTexts = str(ChallengeTexts).splitlines()
+        ExpectedLines = [ChallengeText.strip() for ChallengeText in ChallengeTexts if str(ChallengeText).strip()]
+        ServedLines = [ServedText.strip() for ServedText in ChallengeRespon.text.splitlines() if ServedText.strip()]
+        return ServedLines == ExpectedLines
+
+    # Preflight check, waiting every challenge file served correctly
+    def ValidationFileCheck(self,VerifyRequestFiles,Timeout=60,Interval=2):
+        try:
+            PendingFiles = []
+            for VerifyRequestFile in VerifyRequestFiles:
+                if not VerifyRequestFile.get("url") and not self.PreflightURL:
+                    a4zlog.warning("Unable check challenge file without validation URL")
+                    return False
+                PendingFiles.append(VerifyRequestFile)
+            DeadlineTime = monotonic() + Timeout
+            with ThreadPoolExecutor(max_workers=min(len(PendingFiles),8) or 1) as FetchPool:
+                while PendingFiles:
+                    FetchJobs = [(FetchPool.submit(self.FetchValidationFile,PendingFile),PendingFile) for PendingFile in PendingFiles]
+                    PendingFiles = []
+                    for FetchJob,PendingFile in FetchJobs:
+                        try:
+                            if FetchJob.result() is True:
+                                continue
+                        except Exception as FetchError:
+                            a4zlog.debug(f"Challenge file fetch failed |{PendingFile.get('url')} |{FetchError}")
+                        PendingFiles.append(PendingFile)
+                    if not PendingFiles:
+                        break
+                    RemainTime = DeadlineTime - monotonic()
+                    if RemainTime <= 0:
+                        a4zlog.warning(f"Challenge file not served before timeout |{[PendingFile.get('url') for PendingFile in PendingFiles]}")
+                        return False
+                    sleep(min(Interval,RemainTime))
+            return True
+        except Exception as ValidationFileCheckError:
+            a4zlog.exception(f"Error occurred during check challenge file |{ValidationFileCheckError}")
+            return False
+
     # Delete ACME Challenge file after verify
     def DeleteValidationFile(self,VerifyRequestFile):
         try:
@@ -266,40 +1471,41 @@ class Runtime():
         # QC 2026B11
 
     # Install certificate to folder, reload is optional
-    def Install(self,CertificateContent,ServerCommand=None):
+    def Install(self,CertificateContent,ServerCommand=None,Reload=None):
         try:
-            # Move private key from pending to folder
             PKPending = Path(self.PendingPK)
-            PKActive = Path(self.ActivePK)
-            PKActive.parent.mkdir(parents=True,exist_ok=True)
-            with PKPending.open("r") as PendingPrivateKey,PKActive.open("w") as ActivePrivateKey:
-                ActivePrivateKey.write(PendingPrivateKey.read())
-            # Certificate
-            Certificate = Path(self.Certificate)
-            Certificate.parent.mkdir(parents=True,exist_ok=True)
             CAString = CertificateContent.get("certificate.crt","")
-            with Certificate.open("w") as ActiveCertificate:
-                ActiveCertificate.write(CAString)
-            # Save certificate authority bundle
-            CertificateBA = Path(self.CertificateBA)
-            CertificateBA.parent.mkdir(parents=True,exist_ok=True)
             CABString = CertificateContent.get("ca_bundle.crt","")
-            with CertificateBA.open("w") as ActiveCertificateBA:
-                ActiveCertificateBA.write(CABString)
-            sleep(5)
+            # Same certificate already installed, skip write and reload
+            if self.Installed(CAString) and all(Path(OutputPath).is_file() for OutputPath in self.OutputPaths()):
+                a4zlog.info("Certificate unchanged, skip install and server reload")
+                PKPending.unlink(missing_ok=True)
+                return 304
+            # Private key, certificate and bundle, keep installed file mode
+            PKString = PKPending.read_bytes()
+            InstallFiles = [[self.ActivePK,PKString,0o600],
+                            [self.Certificate,CAString,0o644],
+                            [self.CertificateBA,CABString,0o644]]
+            InstallFiles.extend(self.OutputFiles(CAString,CABString,PKString))
+            if self.Versioned.get("Folder"):
+                self.InstallVersion(InstallFiles,CAString)
+            else:
+                for InstallPath,InstallContent,InstallMode in InstallFiles:
+                    AtomicFile.Write(InstallPath,InstallContent,FileMode=self.FileMode(InstallPath,InstallMode))
+            # Server reload deferred to coordinator, run once after last install
+            if ServerCommand is not None and Reload is not None:
+                Reload.Register(ServerCommand,self.CommonName)
+                PKPending.unlink()
+                return ServerCommand
             # Server reload or restart option
-            if ServerCommand is not None:
-                ServerStatus = subprocess.Popen(ServerCommand,stdout=subprocess.PIPE,stderr=subprocess.PIPE,text=True)
-                # Discard output
-                stdout,stderr = ServerStatus.communicate()
+            elif ServerCommand is not None:
                 # Check if reboot command successful
-                if ServerStatus.returncode == 0:
+                if self.ServerReload(ServerCommand):
                     # Cleanup pending private key
                     PKPending.unlink()
                     return ServerCommand
                 # Restart or reload fail
                 else:
-                    a4zlog.error(f"Unable running server reload/restart command |{stdout} |{stderr}")
                     return False
             else:
                 # Cleanup pending private key
@@ -308,7 +1514,6 @@ class Runtime():
         except Exception as CertificateInstallError:
             a4zlog.exception(f"Error occurred during install certificate or reload/restart server |{CertificateInstallError}")
             return False
-        # QC 2026D23
 
 # Sending Telegram message
 class Telegram():
@@ -319,8 +1524,9 @@ class Telegram():
             self.ChatID       = self.TgConfig['Telegram_BOTs']['ChatID']
             self.Domainheader = self.TgConfig['Certificate']['Domains'][0]
             self.Com = API()
+            self.Http = Transport.Shared(self.TgConfig)
             # Print message
-            self.RtM          = Runtime(ConfigFile)
+            self.RtM          = Runtime(self.TgConfig)
         except Exception as TelegramInitialError:
             a4zlog.exception(f"Telegram__init__ |{TelegramInitialError}")
             raise
@@ -336,8 +1542,7 @@ class Telegram():
             MessageText = {"chat_id":f"{self.ChatID}","text":MessageHeader}
             # Connetc URL
             TelegramSendURL = (self.Com.Telegram + f"{self.BotToken}/sendMessage")
-            with requests.Session() as SendingMessage:
-                TelegramResponse = SendingMessage.post(TelegramSendURL,json=MessageText,timeout=30)
+            TelegramResponse = self.Http.Request("POST",TelegramSendURL,json=MessageText,timeout=30)
             if TelegramResponse.status_code == 200:
                 # Runtime printout
                 self.RtM.Message(TelegramMessage)
@@ -357,8 +1562,7 @@ class Telegram():
                 return
             # Connetc URL
             AskChatIDURL = (self.Com.Telegram + f"{self.BotToken}/getUpdates")
-            with requests.Session() as AskChatID:
-                TelegramResponse = AskChatID.post(AskChatIDURL,timeout=30)
+            TelegramResponse = self.Http.Request("POST",AskChatIDURL,timeout=30)
             if TelegramResponse.status_code == 200:
                 TelegramData = TelegramResponse.json()
             else:
@@ -380,15 +1584,29 @@ class Telegram():
         # QC 2026D30
 
 # Cloudflare API package
-class Cloudflare():
+class Cloudflare(APIClient):
     def __init__(self,ConfigFile):
         try:
             self.CfConfig = Configuration(ConfigFile).Load
             self.Token    = self.CfConfig['CloudflareAPI']['Token']
-            self.Zone     = self.CfConfig['CloudflareRecords']['ZoneID']
+            # Zone ID, discovered from account zones by domain when empty
+            self.Zone     = self.CfConfig['CloudflareRecords'].get("ZoneID") or ""
+            self.ZoneDiscovery = bool(self.CfConfig['CloudflareRecords'].get("ZoneDiscovery",not self.Zone))
+            self.ZoneAge  = float(self.CfConfig['CloudflareRecords'].get("ZoneAge",86400))
+            # Local records index, (name, type) to record ID and content
+            self.IndexFolder = Path(self.CfConfig['CloudflareRecords'].get("IndexFolder") or Path(tempfile.gettempdir(),"acme4zerossl.cloudflare"))
+            self.IndexAge    = float(self.CfConfig['CloudflareRecords'].get("IndexAge",86400))
+            self.PerPage     = int(self.CfConfig['CloudflareRecords'].get("PerPage",500))
+            self.Indexes     = {}
+            self.IndexLock   = threading.Lock()
+            # Synced time and zones
+            self.ZoneCache   = None
             self.Com = API()
+            self.Http = Transport.Shared(self.CfConfig)
             # Generate Cloudflare API request header
             self.CFHeader = {"Authorization":f"Bearer {self.Token}","Content-Type":"application/json"}
+            # Last API error, structured error for caller
+            self.LastError = None
         except Exception as CloudflareInitialError:
             a4zlog.exception(f"Cloudflare__init__ |{CloudflareInitialError}")
             raise
@@ -396,19 +1614,21 @@ class Cloudflare():
     # Verify Cloudflare API token
     def Verify(self,DisplayVerifyResult=None):
         try:
+            self.LastError = None
             VerifyTokenAPI = (self.Com.Cloudflare + "user/tokens/verify")
-            with requests.Session() as VerifyRequest:
-                VerifyResponse = VerifyRequest.get(VerifyTokenAPI,headers=self.CFHeader,timeout=30)
-                if VerifyResponse.status_code == 200:
-                    VerifyResult = VerifyResponse.json()
-                else:
-                    a4zlog.warning(f"Unable connect Cloudflare API |HTTP {VerifyResponse.status_code}")
-                    return False
+            VerifyResponse = self.Http.Request("GET",VerifyTokenAPI,Provider="Cloudflare",headers=self.CFHeader,timeout=30)
+            if VerifyResponse.status_code == 200:
+                VerifyResult = VerifyResponse.json()
+            else:
+                self.LastError = APIError("Cloudflare",VerifyResponse.status_code)
+                a4zlog.warning(f"Unable connect Cloudflare API |HTTP {VerifyResponse.status_code}")
+                return False
             # Check respon status
             ResponseStatusCheck = VerifyResult.get("success")
             # Error
             if ResponseStatusCheck == False:
                 VerifyError = VerifyResult.get("errors")
+                self.LastError = APIError("Cloudflare",200,VerifyError)
                 a4zlog.warning(f"Error occurred during update verify token |API {VerifyError}")
                 return False
             # Success
@@ -421,78 +1641,597 @@ class Cloudflare():
             return False
         # QC 2026D30
 
-    # Download all DNS records from Cloudflare
-    def GetDNSRecords(self,FileOutput=None):
+    # Zone cache file, per API token
+    def ZonePath(self):
+        return self.IndexFolder / f"zones.{hashlib.sha256(str(self.Token).encode('utf-8')).hexdigest()[:16]}.json"
+
+    # Listing account zones, all pages, name to zone ID
+    def ListZones(self):
         try:
-            GetZoneDNSRecordsAPI = (self.Com.Cloudflare + f"zones/{self.Zone}/dns_records")
-            with requests.Session() as GetCloudflareRecords:
-                RecordsRespon = GetCloudflareRecords.get(GetZoneDNSRecordsAPI,headers=self.CFHeader,timeout=30)
-                # Check HTTP status
-                if RecordsRespon.status_code == 200:
-                    RecordsResponData = RecordsRespon.json()
+            self.LastError = None
+            AccountZones = {}
+            Page = 1
+            while True:
+                ZonesAPI = (self.Com.Cloudflare + f"zones?page={Page}&per_page=50")
+                ZonesRespon = self.Http.Request("GET",ZonesAPI,Provider="Cloudflare",headers=self.CFHeader,timeout=30)
+                if ZonesRespon.status_code == 200:
+                    ZonesResponData = ZonesRespon.json()
                 else:
-                    a4zlog.warning(f"Unable connect Cloudflare API |HTTP {RecordsRespon.status_code}")
+                    self.LastError = APIError("Cloudflare",ZonesRespon.status_code)
+                    a4zlog.warning(f"Unable connect Cloudflare API |HTTP {ZonesRespon.status_code}")
+                    return False
+                if ZonesResponData.get("success") == False:
+                    self.LastError = APIError("Cloudflare",200,ZonesResponData.get('errors'))
+                    a4zlog.warning(f"Error occurred during listing zones |API {ZonesResponData.get('errors')}")
                     return False
-            # Return records as dict
+                for CloudflareZone in ZonesResponData.get("result") or []:
+                    AccountZones[str(CloudflareZone.get("name","")).lower()] = CloudflareZone.get("id")
+                ResultInfo = ZonesResponData.get("result_info") or {}
+                if not ZonesResponData.get("result") or Page >= int(ResultInfo.get("total_pages",1) or 1):
+                    return AccountZones
+                Page += 1
+        except Exception as ListZonesError:
+            a4zlog.exception(f"Error occurred during listing zones |{ListZonesError}")
+            return False
+
+    # Account zones, disk cache within zone age
+    def Zones(self,Refresh=False):
+        ZonePath = self.ZonePath()
+        # Synced time and zones, memory and disk cache expire after zone age
+        def LoadZones():
+            if not Refresh:
+                try:
+                    with ZonePath.open("r",encoding="utf-8") as ZoneContent:
+                        ZoneData = json.load(ZoneContent)
+                    if time_ns() / 1e9 - ZoneData.get("synced",0) < self.ZoneAge:
+                        return ZoneData['synced'],ZoneData['zones']
+                except (OSError,ValueError,KeyError,AttributeError):
+                    pass
+            AccountZones = self.ListZones()
+            if AccountZones is False:
+                return False
+            SyncedTime = time_ns() / 1e9
+            self.IndexFolder.mkdir(mode=0o700,parents=True,exist_ok=True)
+            AtomicFile.Write(ZonePath,json.dumps({"synced":SyncedTime,"zones":AccountZones}),FileMode=0o600)
+            return SyncedTime,AccountZones
+        with self.IndexLock:
+            if not Refresh and self.ZoneCache is not None and time_ns() / 1e9 - self.ZoneCache[0] < self.ZoneAge:
+                return self.ZoneCache[1]
+        try:
+            ZoneData = StateLock(ZonePath).Run(LoadZones)
+        except OSError as ZonesError:
+            a4zlog.warning(f"Zone cache not available |{ZonesError}")
+            AccountZones = self.ListZones()
+            ZoneData = (time_ns() / 1e9,AccountZones) if AccountZones is not False else False
+        if not ZoneData or not isinstance(ZoneData[1],dict):
+            return False
+        with self.IndexLock:
+            self.ZoneCache = ZoneData
+        return ZoneData[1]
+
+    # Zone ID of domain, longest suffix match, configured zone when discovery disabled
+    def ZoneFor(self,Domain):
+        if not self.ZoneDiscovery:
+            return self.Zone
+        DomainLabels = str(Domain or "").rstrip(".").lower().split(".")
+        # Cached zones first, refresh once when zone added after cached
+        for Refresh in (False,True):
+            AccountZones = self.Zones(Refresh)
+            if not isinstance(AccountZones,dict):
+                break
+            for LabelIndex in range(len(DomainLabels)):
+                ZoneID = AccountZones.get(".".join(DomainLabels[LabelIndex:]))
+                if ZoneID:
+                    return ZoneID
+        return self.Zone
+
+    # Listing DNS records, single page, optional exact name filter
+    def ListRecords(self,Zone=None,Name=None,Page=1):
+        try:
+            self.LastError = None
+            ListQuery = f"?page={Page}&per_page={self.PerPage}"
+            if Name:
+                ListQuery += f"&name={Name}"
+            ListRecordsAPI = (self.Com.Cloudflare + f"zones/{Zone or self.Zone}/dns_records" + ListQuery)
+            RecordsRespon = self.Http.Request("GET",ListRecordsAPI,Provider="Cloudflare",headers=self.CFHeader,timeout=30)
+            # Check HTTP status
+            if RecordsRespon.status_code == 200:
+                RecordsResponData = RecordsRespon.json()
+            else:
+                self.LastError = APIError("Cloudflare",RecordsRespon.status_code)
+                a4zlog.warning(f"Unable connect Cloudflare API |HTTP {RecordsRespon.status_code}")
+                return False
             GetRecordsStatus = RecordsResponData.get("success")
             if GetRecordsStatus == False:
                 GetRecordsError = RecordsResponData.get("errors")
+                self.LastError = APIError("Cloudflare",200,GetRecordsError)
                 a4zlog.warning(f"Error occurred during download DNS records |API {GetRecordsError}")
                 return False
-            # Enable records file output
+            return RecordsResponData
+        except Exception as ListRecordsError:
+            a4zlog.exception(f"Error occurred during download DNS records |{ListRecordsError}")
+            return False
+
+    # Walking all pages, each record passed to consumer, return records count
+    def WalkRecords(self,Consumer,Zone=None,Name=None):
+        Page = 1
+        RecordsCount = 0
+        while True:
+            RecordsResponData = self.ListRecords(Zone,Name,Page)
+            if not isinstance(RecordsResponData,dict):
+                return False
+            for Record in RecordsResponData.get("result") or []:
+                Consumer(Record)
+                RecordsCount += 1
+            ResultInfo = RecordsResponData.get("result_info") or {}
+            if not RecordsResponData.get("result") or Page >= int(ResultInfo.get("total_pages",1) or 1):
+                return RecordsCount
+            Page += 1
+
+    # DNS records as models, all pages
+    def Records(self,Zone=None,Name=None):
+        DNSRecords = []
+        if self.WalkRecords(lambda Record: DNSRecords.append(DNSRecord.FromDict(Record)),Zone,Name) is False:
+            return False
+        return DNSRecords
+
+    # Download all DNS records from Cloudflare, all pages
+    def GetDNSRecords(self,FileOutput=None):
+        try:
+            # Enable records file output, streaming page by page
             if FileOutput is not None:
                 RecordsOutputPath = Path(FileOutput)
-                with RecordsOutputPath.open("w",encoding="utf-8") as RecordsFile:
-                    json.dump(RecordsResponData,RecordsFile,indent=3)
+                RecordsOutputPath.parent.mkdir(parents=True,exist_ok=True)
+                TempFD,TempPath = tempfile.mkstemp(prefix=f".{RecordsOutputPath.name}.",dir=str(RecordsOutputPath.parent))
+                try:
+                    with os.fdopen(TempFD,"w",encoding="utf-8") as RecordsFile:
+                        RecordsFile.write('{"success": true, "result": [')
+                        Separator = [""]
+                        def WriteRecord(Record):
+                            RecordsFile.write(Separator[0] + "\n" + json.dumps(Record))
+                            Separator[0] = ","
+                        RecordsCount = self.WalkRecords(WriteRecord)
+                        RecordsFile.write("\n]}\n")
+                    if RecordsCount is False:
+                        Path(TempPath).unlink(missing_ok=True)
+                        return False
+                    os.replace(TempPath,RecordsOutputPath)
+                except BaseException:
+                    Path(TempPath).unlink(missing_ok=True)
+                    raise
                 return FileOutput
             else:
-                return RecordsResponData
+                DNSRecords = []
+                if self.WalkRecords(DNSRecords.append) is False:
+                    return False
+                return {"success":True,"result":DNSRecords}
         except Exception as GetCFRecordsError:
             a4zlog.exception(f"Error occurred during download DNS records |{GetCFRecordsError}")
             return False
-        # QC 2026D30
 
-    # Update CNAME records at Cloudflare
-    def UpdateCNAME(self,UpdatePayload):
+    # Index key, lower case name and type
+    @staticmethod
+    def IndexKey(Name,Type):
+        return f"{str(Name).rstrip('.').lower()}|{str(Type).upper()}"
+
+    # Adding record model into index
+    def IndexRecord(self,IndexRecords,Record):
+        IndexRecords[self.IndexKey(Record.name,Record.type)] = Record.IndexEntry()
+
+    # Index file path per zone
+    def IndexPath(self,Zone=None):
+        return self.IndexFolder / f"{Zone or self.Zone}.index.json"
+
+    # Loading index, memory first then disk
+    def LoadIndex(self,Zone=None):
+        Zone = Zone or self.Zone
+        with self.IndexLock:
+            if Zone in self.Indexes:
+                return self.Indexes[Zone]
         try:
-            # Records ID check
-            RecordID = UpdatePayload.get("cname_id")
-            if not RecordID:
-                a4zlog.warning(f"Error occurred during phrasing CNAME update payload |Record ID {RecordID}")
-                return False
+            with self.IndexPath(Zone).open("r",encoding="utf-8") as IndexContent:
+                IndexData = json.load(IndexContent)
+        except (OSError,ValueError):
+            return None
+        with self.IndexLock:
+            self.Indexes[Zone] = IndexData
+        return IndexData
+
+    # Storing index, memory and disk
+    def StoreIndex(self,IndexData,Zone=None):
+        Zone = Zone or self.Zone
+        with self.IndexLock:
+            self.Indexes[Zone] = IndexData
+        AtomicFile.Write(self.IndexPath(Zone),json.dumps(IndexData),FileMode=0o600)
+
+    # Sync records index, full zone streamed to disk or single name refreshed
+    def SyncRecords(self,Zone=None,Name=None):
+        Zone = Zone or self.Zone
+        try:
+            self.IndexFolder.mkdir(mode=0o700,parents=True,exist_ok=True)
+            def Refresh():
+                IndexData = self.LoadIndex(Zone) if Name else None
+                if not isinstance(IndexData,dict):
+                    IndexData = {"zone":Zone,"synced":0,"records":{}}
+                IndexRecords = IndexData.setdefault("records",{})
+                if Name:
+                    # Records of name, all types
+                    NamePrefix = self.IndexKey(Name,"")
+                    for IndexKey in [IndexKey for IndexKey in IndexRecords if IndexKey.startswith(NamePrefix)]:
+                        IndexRecords.pop(IndexKey)
+                    RecordsCount = self.WalkRecords(lambda Record: self.IndexRecord(IndexRecords,DNSRecord.FromDict(Record)),Zone,Name)
+                else:
+                    # Records streamed as JSON lines, index built while walking
+                    RecordsPath = self.IndexFolder / f"{Zone}.records.jsonl"
+                    TempFD,TempPath = tempfile.mkstemp(prefix=f".{RecordsPath.name}.",dir=str(self.IndexFolder))
+                    try:
+                        with os.fdopen(TempFD,"w",encoding="utf-8") as RecordsFile:
+                            def StreamRecord(Record):
+                                RecordsFile.write(json.dumps(Record) + "\n")
+                                self.IndexRecord(IndexRecords,DNSRecord.FromDict(Record))
+                            RecordsCount = self.WalkRecords(StreamRecord,Zone)
+                        if RecordsCount is False:
+                            Path(TempPath).unlink(missing_ok=True)
+                        else:
+                            os.chmod(TempPath,0o600)
+                            os.replace(TempPath,RecordsPath)
+                    except BaseException:
+                        Path(TempPath).unlink(missing_ok=True)
+                        raise
+                    IndexData["synced"] = time_ns() / 1e9
+                if RecordsCount is False:
+                    return False
+                self.StoreIndex(IndexData,Zone)
+                return IndexData
+            return StateLock(self.IndexPath(Zone)).Run(Refresh)
+        except Exception as SyncRecordsError:
+            a4zlog.exception(f"Error occurred during sync DNS records index |{SyncRecordsError}")
+            return False
+
+    # Index lookup, full sync when index missing or older than index age
+    def LookupRecord(self,Name,Type="CNAME",Zone=None):
+        IndexData = self.LoadIndex(Zone)
+        if not isinstance(IndexData,dict) or time_ns() / 1e9 - IndexData.get("synced",0) > self.IndexAge:
+            IndexData = self.SyncRecords(Zone)
+        if not isinstance(IndexData,dict):
+            return None
+        return IndexData['records'].get(self.IndexKey(Name,Type))
+
+    # Previous challenge record of domain, _MD5.domain CNAME
+    def ChallengeRecord(self,Domain,Zone=None):
+        IndexData = self.LoadIndex(Zone)
+        if not isinstance(IndexData,dict):
+            return None
+        ChallengeSuffix = self.IndexKey(f".{Domain}","CNAME")
+        for IndexKey,IndexRecord in IndexData['records'].items():
+            ChallengeLabel = IndexKey[:-len(ChallengeSuffix)]
+            if IndexKey.endswith(ChallengeSuffix) and len(ChallengeLabel) == 33 and ChallengeLabel.startswith("_"):
+                return IndexRecord
+        return None
+
+    # Record ID for challenge name, exact name first, then previous challenge of same domain
+    def ResolveRecordID(self,CNAMEText,Zone=None):
+        IndexRecord = self.LookupRecord(CNAMEText,"CNAME",Zone)
+        if IndexRecord is None:
+            IndexRecord = self.ChallengeRecord(str(CNAMEText).split(".",1)[-1],Zone)
+        return IndexRecord.get("id") if IndexRecord else None
+
+    # Indexed record has same name and content
+    def Unchanged(self,RecordID,CNAMEText,CNAMEValue,Zone=None):
+        IndexData = self.LoadIndex(Zone)
+        if not isinstance(IndexData,dict):
+            return False
+        IndexRecord = IndexData['records'].get(self.IndexKey(CNAMEText,"CNAME"))
+        if not IndexRecord or (RecordID and IndexRecord.get("id") != RecordID):
+            return False
+        return str(IndexRecord.get("content","")).rstrip(".").lower() == str(CNAMEValue).rstrip(".").lower()
+
+    # Response for skipped update, same structure as API response
+    def UnchangedResult(self,RecordID,CNAMEText,CNAMEValue,Zone=None):
+        IndexRecord = self.LoadIndex(Zone)['records'].get(self.IndexKey(CNAMEText,"CNAME"))
+        a4zlog.info(f"CNAME record unchanged, skip update |{CNAMEText}")
+        return {"success":True,"unchanged":True,"result":{"id":RecordID or IndexRecord.get("id"),"type":"CNAME","name":CNAMEText,"content":CNAMEValue}}
+
+    # Update many CNAME records, one batch request per zone, result list in payload order
+    def UpdateCNAMEBatch(self,UpdatePayloads,Zone=None):
+        BatchResults = [False] * len(UpdatePayloads)
+        ZonePayloads = {}
+        for PayloadIndex,UpdatePayload in enumerate(UpdatePayloads):
+            PayloadZone = Zone or UpdatePayload.get("zone") or self.ZoneFor(UpdatePayload.get("cname"))
+            if not PayloadZone:
+                a4zlog.warning(f"Unable find Cloudflare zone |{UpdatePayload.get('cname')}")
+                continue
+            ZonePayloads.setdefault(PayloadZone,[]).append(PayloadIndex)
+        # First API error kept, later zone request clears it
+        BatchError = None
+        for PayloadZone,PayloadOrder in ZonePayloads.items():
+            ZoneResults = self.UpdateZoneBatch([UpdatePayloads[PayloadIndex] for PayloadIndex in PayloadOrder],PayloadZone)
+            BatchError = BatchError or self.LastError
+            for PayloadIndex,ZoneResult in zip(PayloadOrder,ZoneResults):
+                BatchResults[PayloadIndex] = ZoneResult
+        self.LastError = BatchError
+        return BatchResults
+
+    # Update CNAME records of single zone in one batch request
+    def UpdateZoneBatch(self,UpdatePayloads,Zone):
+        try:
+            self.LastError = None
+            BatchResults = [False] * len(UpdatePayloads)
+            BatchPuts,BatchPosts,PutOrder,PostOrder = [],[],[],[]
+            for PayloadIndex,UpdatePayload in enumerate(UpdatePayloads):
+                CNAMEText = UpdatePayload.get("cname")
+                CNAMEValue = UpdatePayload.get("value")
+                if not (CNAMEText and CNAMEValue):
+                    a4zlog.warning(f"Error occurred during phrasing CNAME update payload |CNAME {CNAMEText} |Value {CNAMEValue}")
+                    continue
+                RecordID = UpdatePayload.get("cname_id") or self.ResolveRecordID(CNAMEText,Zone)
+                if self.Unchanged(RecordID,CNAMEText,CNAMEValue,Zone):
+                    BatchResults[PayloadIndex] = self.UnchangedResult(RecordID,CNAMEText,CNAMEValue,Zone)
+                    continue
+                UpdateCNAMEContent = {"type":"CNAME","name":CNAMEText,"content":CNAMEValue,"proxied":False,"ttl":1}
+                if RecordID:
+                    BatchPuts.append(dict(UpdateCNAMEContent,id=RecordID))
+                    PutOrder.append(PayloadIndex)
+                else:
+                    BatchPosts.append(UpdateCNAMEContent)
+                    PostOrder.append(PayloadIndex)
+            # Single record, no batch needed
+            if len(PutOrder) + len(PostOrder) <= 1:
+                for PayloadIndex,BatchRecord in zip(PutOrder + PostOrder,BatchPuts + BatchPosts):
+                    BatchResults[PayloadIndex] = self.UpdateCNAME({"cname_id":BatchRecord.get("id"),"cname":BatchRecord["name"],"value":BatchRecord["content"]},Zone)
+                return BatchResults
+            BatchAPI = (self.Com.Cloudflare + f"zones/{Zone}/dns_records/batch")
+            BatchRespon = self.Http.Request("POST",BatchAPI,Provider="Cloudflare",headers=self.CFHeader,data=json.dumps({"puts":BatchPuts,"posts":BatchPosts}),timeout=30)
+            if BatchRespon.status_code == 200:
+                BatchResponData = BatchRespon.json()
+            else:
+                self.LastError = APIError("Cloudflare",BatchRespon.status_code)
+                a4zlog.warning(f"Unable connect Cloudflare API |HTTP {BatchRespon.status_code}")
+                return BatchResults
+            # Batch is single transaction, all or nothing
+            if BatchResponData.get("success") == False:
+                self.LastError = APIError("Cloudflare",200,BatchResponData.get('errors'))
+                a4zlog.warning(f"Error occurred during batch update CNAME records |API {BatchResponData.get('errors')}")
+                return BatchResults
+            BatchResult = BatchResponData.get("result") or {}
+            for ResultKey,ResultOrder in (("puts",PutOrder),("posts",PostOrder)):
+                for PayloadIndex,Record in zip(ResultOrder,BatchResult.get(ResultKey) or []):
+                    self.IndexUpdate(Record,Zone)
+                    BatchResults[PayloadIndex] = {"success":True,"result":Record}
+            a4zlog.info(f"CNAME records batch updated |{len(PutOrder)} updated |{len(PostOrder)} created")
+            return BatchResults
+        except Exception as BatchUpdateError:
+            a4zlog.exception(f"Error occurred during batch update CNAME records |{BatchUpdateError}")
+            return [False] * len(UpdatePayloads)
+
+    # Index entry after update, old name of same record ID removed
+    def IndexUpdate(self,Record,Zone=None):
+        IndexData = self.LoadIndex(Zone)
+        Record = DNSRecord.FromDict(Record)
+        if not isinstance(IndexData,dict) or not Record.id:
+            return
+        with self.IndexLock:
+            IndexRecords = IndexData.setdefault("records",{})
+            for IndexKey in [IndexKey for IndexKey,IndexRecord in IndexRecords.items() if IndexRecord.get("id") == Record.id]:
+                IndexRecords.pop(IndexKey)
+            self.IndexRecord(IndexRecords,Record)
+        try:
+            self.StoreIndex(IndexData,Zone)
+        except OSError as IndexUpdateError:
+            a4zlog.warning(f"Unable update DNS records index |{IndexUpdateError}")
+
+    # Update CNAME records at Cloudflare, record ID resolved from index when not configured
+    def UpdateCNAME(self,UpdatePayload,Zone=None):
+        try:
+            self.LastError = None
             # CNAME update payload
             CNAMEText = UpdatePayload.get("cname")
             CNAMEValue = UpdatePayload.get("value")
             if not (CNAMEText and CNAMEValue):
                 a4zlog.warning(f"Error occurred during phrasing CNAME update payload |CNAME {CNAMEText} |Value {CNAMEValue}")
                 return False
+            # Zone routing by record name
+            Zone = Zone or UpdatePayload.get("zone") or self.ZoneFor(CNAMEText)
+            if not Zone:
+                a4zlog.warning(f"Unable find Cloudflare zone |{CNAMEText}")
+                return False
+            # Records ID check
+            RecordID = UpdatePayload.get("cname_id") or self.ResolveRecordID(CNAMEText,Zone)
+            # Indexed record already same, skip update
+            if self.Unchanged(RecordID,CNAMEText,CNAMEValue,Zone):
+                return self.UnchangedResult(RecordID,CNAMEText,CNAMEValue,Zone)
             # Payload
             UpdateCNAMEContent = {"type":"CNAME","name":CNAMEText,"content":CNAMEValue,"proxiable":False,"proxied":False,"ttl":1}
             UpdateCNAMEJSON = json.dumps(UpdateCNAMEContent)
-            # Update
-            UpdateCNAMEAPI = (self.Com.Cloudflare + f"zones/{self.Zone}/dns_records/{RecordID}")
-            with requests.Session() as RequestCNAMEUpdate:
-                UpdateRespon = RequestCNAMEUpdate.put(UpdateCNAMEAPI,headers=self.CFHeader,data=UpdateCNAMEJSON,timeout=30)
-                if UpdateRespon.status_code == 200:
-                    UpdateResponData = UpdateRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect Cloudflare API |HTTP {UpdateRespon.status_code}")
-                    return False
+            # Update, or create when record not found
+            if RecordID:
+                UpdateCNAMEAPI = (self.Com.Cloudflare + f"zones/{Zone}/dns_records/{RecordID}")
+                UpdateRespon = self.Http.Request("PUT",UpdateCNAMEAPI,Provider="Cloudflare",headers=self.CFHeader,data=UpdateCNAMEJSON,timeout=30)
+            else:
+                a4zlog.info(f"CNAME record not found, create new record |{CNAMEText}")
+                UpdateCNAMEAPI = (self.Com.Cloudflare + f"zones/{Zone}/dns_records")
+                UpdateRespon = self.Http.Request("POST",UpdateCNAMEAPI,Provider="Cloudflare",headers=self.CFHeader,data=UpdateCNAMEJSON,timeout=30)
+            if UpdateRespon.status_code == 200:
+                UpdateResponData = UpdateRespon.json()
+            else:
+                self.LastError = APIError("Cloudflare",UpdateRespon.status_code)
+                a4zlog.warning(f"Unable connect Cloudflare API |HTTP {UpdateRespon.status_code}")
+                return False
             # Check
             UpdateResponCheck = UpdateResponData.get("success")
             if UpdateResponCheck == False:
                 UpdateCNAMEError = UpdateResponData.get("errors")
+                self.LastError = APIError("Cloudflare",200,UpdateCNAMEError)
                 a4zlog.warning(f"Error occurred during update CNAME record |API {UpdateCNAMEError}")
                 return False
             else:
+                self.IndexUpdate(UpdateResponData.get("result") or {},Zone)
                 return UpdateResponData
         except Exception as UpdateCNAMEError:
             a4zlog.exception(f"Error occurred during update CNAME record |{UpdateCNAMEError}")
             return False
-        # QC 2026E03
+
+# CNAME update batcher, concurrent renewals submitted as one batch request per zone
+class RecordBatcher():
+    def __init__(self,Window=1):
+        # Collecting seconds after first submission
+        self.Window  = float(Window)
+        self.Lock    = threading.Lock()
+        # Credential and zone as key, value is Cloudflare instance and submissions
+        self.Pending = {}
+        self.Timer   = None
+
+    # Submit payloads, blocking until batch sent, result list in payload order
+    def Submit(self,Cf,UpdatePayloads,Zone=None):
+        Submission = {"payloads":list(UpdatePayloads),"results":None,"event":threading.Event()}
+        with self.Lock:
+            self.Pending.setdefault((Cf.Token,Zone or Cf.Zone),[Cf,[]])[1].append(Submission)
+            if self.Timer is None:
+                self.Timer = threading.Timer(self.Window,self.Flush)
+                self.Timer.daemon = True
+                self.Timer.start()
+        Submission["event"].wait()
+        return Submission["results"]
+
+    # Sending collected payloads
+    def Flush(self):
+        with self.Lock:
+            PendingBatches = self.Pending
+            self.Pending = {}
+            self.Timer = None
+        for (_,Zone),(Cf,Submissions) in PendingBatches.items():
+            try:
+                BatchResults = Cf.UpdateCNAMEBatch([UpdatePayload for Submission in Submissions for UpdatePayload in Submission["payloads"]],Zone)
+            except Exception as FlushError:
+                a4zlog.exception(f"Error occurred during batch update CNAME records |{FlushError}")
+                BatchResults = []
+            ResultOffset = 0
+            for Submission in Submissions:
+                PayloadCount = len(Submission["payloads"])
+                Submission["results"] = (BatchResults[ResultOffset:ResultOffset + PayloadCount] + [False] * PayloadCount)[:PayloadCount]
+                ResultOffset += PayloadCount
+                Submission["event"].set()
+
+# DNS propagation check, query resolvers directly for CNAME records
+class DNSPropagation():
+    def __init__(self,ConfigFile):
+        try:
+            self.DNSConfig    = Configuration(ConfigFile).Load
+            # Resolvers or authoritative nameservers, host or host:port
+            self.Resolvers    = self.DNSConfig['CloudflareRecords'].get("Resolvers") or ("1.1.1.1","8.8.8.8")
+            # Single query timeout
+            self.QueryTimeout = 2
+        except Exception as DNSPropagationInitialError:
+            a4zlog.exception(f"DNSPropagation__init__ |{DNSPropagationInitialError}")
+            raise
+
+    # Split resolver into address and port
+    @staticmethod
+    def ResolverAddress(Resolver):
+        Resolver = str(Resolver).strip()
+        if Resolver.startswith("["):
+            Host,_,Port = Resolver[1:].partition("]")
+            return Host,int(Port.lstrip(":") or 53)
+        if Resolver.count(":") == 1:
+            Host,Port = Resolver.split(":")
+            return Host,int(Port)
+        return Resolver,53
+
+    # Decode domain name inside DNS message, following compression pointer
+    @staticmethod
+    def ReadName(Message,Offset):
+        Labels = []
+        EndOffset = None
+        for _ in range(128):
+            Length = Message[Offset]
+            # Compression pointer
+            if Length & 0xC0 == 0xC0:
+                if EndOffset is None:
+                    EndOffset = Offset + 2
+                Offset = ((Length & 0x3F) << 8) | Message[Offset + 1]
+                continue
+            if Length == 0:
+                Offset += 1
+                break
+            Labels.append(Message[Offset + 1:Offset + 1 + Length].decode("ascii","replace"))
+            Offset += 1 + Length
+        else:
+            raise ValueError("DNS name compression loop")
+        return ".".join(Labels).lower(),(EndOffset if EndOffset is not None else Offset)
+
+    # Query CNAME target from single resolver, None when not found
+    def Query(self,Name,Resolver):
+        Name = Name.rstrip(".")
+        Host,Port = self.ResolverAddress(Resolver)
+        AddressInfo = socket.getaddrinfo(Host,Port,type=socket.SOCK_DGRAM)[0]
+        # Header with recursion desired, single question, CNAME type and IN class
+        QueryID = random.getrandbits(16)
+        QueryMessage = struct.pack("!HHHHHH",QueryID,0x0100,1,0,0,0)
+        for Label in Name.split("."):
+            LabelBytes = Label.encode("idna")
+            QueryMessage += bytes([len(LabelBytes)]) + LabelBytes
+        QueryMessage += b"\x00" + struct.pack("!HH",5,1)
+        with socket.socket(AddressInfo[0],socket.SOCK_DGRAM) as DNSSocket:
+            DNSSocket.settimeout(self.QueryTimeout)
+            DNSSocket.sendto(QueryMessage,AddressInfo[4])
+            while True:
+                Response,_ = DNSSocket.recvfrom(4096)
+                if len(Response) >= 12 and struct.unpack("!H",Response[:2])[0] == QueryID:
+                    break
+        _,Flags,QuestionCount,AnswerCount,_,_ = struct.unpack("!HHHHHH",Response[:12])
+        # NXDOMAIN or server error
+        if Flags & 0x000F:
+            return None
+        Offset = 12
+        for _ in range(QuestionCount):
+            _,Offset = self.ReadName(Response,Offset)
+            Offset += 4
+        for _ in range(AnswerCount):
+            RecordName,Offset = self.ReadName(Response,Offset)
+            RecordType,_,_,RecordLength = struct.unpack("!HHIH",Response[Offset:Offset + 10])
+            Offset += 10
+            if RecordType == 5 and RecordName == Name.lower():
+                return self.ReadName(Response,Offset)[0]
+            Offset += RecordLength
+        return None
+
+    # Waiting every CNAME record answered by every resolver, False when timeout
+    def Wait(self,UpdatePayloads,Timeout=180,Interval=2):
+        try:
+            # Pending check, record name, expected target and resolver
+            PendingChecks = set()
+            for UpdatePayload in UpdatePayloads:
+                CNAMEText = str(UpdatePayload.get("cname","")).rstrip(".").lower()
+                CNAMEValue = str(UpdatePayload.get("value","")).rstrip(".").lower()
+                if not (CNAMEText and CNAMEValue):
+                    a4zlog.warning(f"Unable check CNAME propagation with empty payload |CNAME {CNAMEText} |Value {CNAMEValue}")
+                    return False
+                for Resolver in self.Resolvers:
+                    PendingChecks.add((CNAMEText,CNAMEValue,Resolver))
+            DeadlineTime = monotonic() + Timeout
+            with ThreadPoolExecutor(max_workers=min(len(PendingChecks),16) or 1) as QueryPool:
+                while PendingChecks:
+                    QueryJobs = {QueryPool.submit(self.Query,Check[0],Check[2]):Check for Check in PendingChecks}
+                    for QueryJob,Check in QueryJobs.items():
+                        try:
+                            if QueryJob.result() == Check[1]:
+                                PendingChecks.discard(Check)
+                        except Exception as QueryError:
+                            a4zlog.debug(f"DNS query failed |{Check[0]} |{Check[2]} |{QueryError}")
+                    if not PendingChecks:
+                        break
+                    RemainTime = DeadlineTime - monotonic()
+                    if RemainTime <= 0:
+                        a4zlog.warning(f"CNAME records not propagated before timeout |{sorted(PendingChecks)}")
+                        return False
+                    sleep(min(Interval,RemainTime))
+            return True
+        except Exception as PropagationError:
+            a4zlog.exception(f"Error occurred during check CNAME propagation |{PropagationError}")
+            return False
 
 # ZeroSSL REST API package
-class ZeroSSL():
+class ZeroSSL(APIClient):
     def __init__(self,ConfigFile):
         try:
             self.ZeroSSLConfig = Configuration(ConfigFile).Load
@@ -502,6 +2241,8 @@ class ZeroSSL():
             self.DomainList    = self.ZeroSSLConfig['Certificate']['Domains']
             self.CommonName    = self.DomainList[0]
             self.AltName       = self.DomainList[1] if len(self.DomainList) > 1 else ""
+            # All subject alternative names, common name first
+            self.Domains       = [Domain for Domain in self.DomainList if isinstance(Domain,str) and Domain.strip()]
             # Please dynamic modify following ZeroSSL roadmap based on Ballot SC-081v3
             self.ValidityDays  = self.ZeroSSLConfig['Certificate']['ValidityDays']
             # ZeroSSL JSON structure
@@ -513,13 +2254,26 @@ class ZeroSSL():
             self.CONTENT       = "file_validation_content"
             # Check ZeroSSL certificate payload when downloading inline
             self.Certificate   = "certificate.crt"
-            # Cloudflare
-            self.CNAMEList     = self.ZeroSSLConfig['CloudflareRecords']['CNAMERecordsID']
+            # Cloudflare records ID, optional, resolved from records index when empty
+            self.CNAMEList     = self.ZeroSSLConfig['CloudflareRecords'].get("CNAMERecordsID") or []
             self.CommonNameID  = self.CNAMEList[0] if self.CNAMEList else ""
             self.AltNameID     = self.CNAMEList[1] if len(self.CNAMEList) > 1 else ""
+            # Records ID in same order as domains
+            self.RecordIDs     = {Domain:(self.CNAMEList[DomainIndex] if DomainIndex < len(self.CNAMEList) else "") for DomainIndex,Domain in enumerate(self.DomainList) if Domain in self.Domains}
+            # CNAME challenge target suffix, for local computed records
+            self.CNAMETarget   = self.ZeroSSLConfig['CloudflareRecords'].get("CNAMETarget","comodoca.com")
+            # Local mirror of account certificates, reuse in-flight certificate before create
+            self.Reuse         = self.ZeroSSLConfig['ZeroSSLAPI'].get("Reuse",True)
+            self.MirrorFile    = Path(self.ZeroSSLConfig['ZeroSSLAPI'].get("Mirror") or Path(self.Validation).with_name("zerossl.mirror.json"))
+            self.MirrorAge     = float(self.ZeroSSLConfig['ZeroSSLAPI'].get("MirrorAge",300))
+            self.MirrorLock    = StateLock(self.MirrorFile)
+            self.ReuseStatus   = ("draft","pending_validation")
             # REST API and Header
             self.Com = API()
+            self.Http = Transport.Shared(self.ZeroSSLConfig)
             self.ZeroSSLHeader = {"Content-Type":"application/json"}
+            # Last API error, structured error for caller
+            self.LastError     = None
         except Exception as ZeroSSLInitialError:
             a4zlog.exception(f"ZeroSSL__init__ |{ZeroSSLInitialError}")
             raise
@@ -527,31 +2281,30 @@ class ZeroSSL():
     # Sending certificate create request
     def Create(self):
         try:
+            self.LastError = None
             # Read Certificates signing request
             CSRFile = Path(self.ZeroSSLCSR)
             with CSRFile.open("r") as CSRFileData:
                 CSRPayload = CSRFileData.read()
-            # Reading domain
-            if len(self.DomainList) > 1 and self.DomainList[1]:
-                CertificateDomains = f"{self.DomainList[0]},{self.DomainList[1]}"
-            else:
-                CertificateDomains = f"{self.DomainList[0]}"
+            # Reading domain, comma separated
+            CertificateDomains = ",".join(self.Domains)
             # Package as JSON
             CertificateCreateContent = {"certificate_domains":CertificateDomains,"certificate_validity_days":self.ValidityDays,"certificate_csr":CSRPayload}
             CertificateCreateJSON = json.dumps(CertificateCreateContent)
             # URL
             CertificateCreateREST = (self.Com.ZeroSSL + f"?access_key={self.ZeroSSLAuth}")
-            with requests.Session() as RequestCreate:
-                CreateRespon = RequestCreate.post(CertificateCreateREST,headers=self.ZeroSSLHeader,data=CertificateCreateJSON,timeout=30)
-                if CreateRespon.status_code == 200:
-                    CreateResponData = CreateRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {CreateRespon.status_code}")
-                    return False
+            CreateRespon = self.Http.Request("POST",CertificateCreateREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,data=CertificateCreateJSON,timeout=30)
+            if CreateRespon.status_code == 200:
+                CreateResponData = CreateRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",CreateRespon.status_code)
+                a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {CreateRespon.status_code}")
+                return False
              # Possible errors respon
             CreateCAError = CreateResponData.get("success")
             if CreateCAError == False:
                 CreateCAErrorStatus = CreateResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,CreateCAErrorStatus)
                 a4zlog.warning(f"Error occurred during request new certificate |API {CreateCAErrorStatus}")
                 return False
             # Check certificate status
@@ -573,65 +2326,253 @@ class ZeroSSL():
             return False
         # QC 2026E03
 
-    # Parsing ZeroSSL verify JSON
-    def PhrasingVerifyJSON(self,VerifyRequest,ValidationMethod="CNAME_CSR_HASH"):
+    # Listing certificates, single page, filter by status and domain search
+    def List(self,Status=None,Search=None,Page=1,Limit=100):
         try:
-            # Additional domain check
-            AdditionalDomainCheck = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.AltName)
-            AdditionalCheck = bool(AdditionalDomainCheck)
-            # Certificate ID
-            VerifyCertificateID = VerifyRequest.get("id",None)
-            # Common Name CNAME
-            CommonName_CNAME = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.CommonName,{}).get(self.CNAME,"")
-            # Common Name VALUE
-            CommonName_VALUE = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.CommonName,{}).get(self.VALUE,"")
-            # Additional domain CNAME
-            Additional_CNAME = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.AltName,{}).get(self.CNAME,"")
-            # Additional domain VALUE
-            Additional_VALUE = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.AltName,{}).get(self.VALUE,"")
-            # Common_domain, verify file path and file name
-            CommonName_FILE = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.CommonName,{}).get(self.FILE,"").replace(f"https://{self.CommonName}/","")
-            # Common_domain, file content
-            CommonName_CONTENT = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.CommonName,{}).get(self.CONTENT,"")
-            # Additional_domains, verify file path and file name
-            Additional_FILE = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.AltName,{}).get(self.FILE,"").replace(f"https://{self.AltName}/","")
-            # Additional_domains, file content
-            Additional_CONTENT = VerifyRequest.get(self.L1,{}).get(self.L2,{}).get(self.AltName,{}).get(self.CONTENT,"")
-            # CNAME_CSR_HASH
-            if ValidationMethod == "CNAME_CSR_HASH" and not AdditionalCheck:
-                CreateCAVerify = {"id":VerifyCertificateID,
-                                  "common_name":{"cname_id":self.CommonNameID,"cname":CommonName_CNAME,"value":CommonName_VALUE}}
-                # Retutn phrasing dict
-                return CreateCAVerify
-            # CNAME_CSR_HASH, additional domain
-            elif ValidationMethod == "CNAME_CSR_HASH" and AdditionalCheck:
-                CreateCAVerify = {"id":VerifyCertificateID,
-                                  "common_name":{"cname_id":self.CommonNameID,"cname":CommonName_CNAME,"value":CommonName_VALUE},
-                                  "additional_domains":{"cname_id":self.AltNameID,"cname":Additional_CNAME,"value":Additional_VALUE}}
-                return CreateCAVerify
-            # HTTPS_CSR_HASH
-            elif ValidationMethod == "HTTPS_CSR_HASH" and not AdditionalCheck:
-                CreateCAVerify = {"id":VerifyCertificateID,
-                                  "common_name":{"file":CommonName_FILE,"content":CommonName_CONTENT}}
-                return CreateCAVerify
-            # HTTPS_CSR_HASH, additional domain
-            elif ValidationMethod == "HTTPS_CSR_HASH" and AdditionalCheck:
-                CreateCAVerify = {"id":VerifyCertificateID,
-                                  "common_name":{"file":CommonName_FILE,"content":CommonName_CONTENT},
-                                  "additional_domains":{"file":Additional_FILE,"content":Additional_CONTENT}}
-                return CreateCAVerify
+            self.LastError = None
+            ListQuery = f"?access_key={self.ZeroSSLAuth}&page={Page}&limit={Limit}"
+            if Status:
+                ListQuery += f"&certificate_status={Status}"
+            if Search:
+                ListQuery += f"&search={Search}"
+            ListRespon = self.Http.Request("GET",self.Com.ZeroSSL + ListQuery,Provider="ZeroSSL",headers=self.ZeroSSLHeader,timeout=30)
+            if ListRespon.status_code == 200:
+                ListResponData = ListRespon.json()
             else:
+                self.LastError = APIError("ZeroSSL",ListRespon.status_code)
+                a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {ListRespon.status_code}")
+                return False
+            # Possible errors respon
+            if ListResponData.get("success") == False:
+                ListErrorStatus = ListResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,ListErrorStatus)
+                a4zlog.warning(f"Error occurred during listing certificates |API {ListErrorStatus}")
+                return False
+            return ListResponData
+        except Exception as ListError:
+            a4zlog.exception(f"Error occurred during listing certificates |{ListError}")
+            return False
+
+    # Listing certificates, all pages, each certificate parsed as model
+    def ListAll(self,Status=None,Search=None,Limit=100):
+        Certificates = []
+        Page = 1
+        while True:
+            ListResponData = self.List(Status,Search,Page,Limit)
+            if not isinstance(ListResponData,dict):
+                return False
+            PageResults = ListResponData.get("results") or []
+            Certificates.extend(CertificateInfo.FromDict(Certificate) for Certificate in PageResults)
+            TotalCount = int(ListResponData.get("total_count",0) or 0)
+            if not PageResults or len(PageResults) < Limit or Page * Limit >= TotalCount:
+                return Certificates
+            Page += 1
+
+    # Reading local mirror, certificates stored as compact model dictionary
+    def ReadMirror(self):
+        try:
+            with self.MirrorFile.open("r",encoding="utf-8") as MirrorContent:
+                MirrorData = json.load(MirrorContent)
+            if isinstance(MirrorData,dict):
+                MirrorData.setdefault("certificates",{})
+                MirrorData.setdefault("synced",{})
+                return MirrorData
+        except (OSError,ValueError):
+            pass
+        return {"certificates":{},"synced":{}}
+
+    # Incremental mirror sync, only status listing older than mirror age is fetched again
+    def Sync(self,Statuses=None,MaxAge=None):
+        Statuses = Statuses or self.ReuseStatus
+        MaxAge = self.MirrorAge if MaxAge is None else MaxAge
+        def Refresh():
+            MirrorData = self.ReadMirror()
+            Now = time_ns() / 1e9
+            MirrorChanged = False
+            for Status in Statuses:
+                if Now - MirrorData['synced'].get(Status,0) < MaxAge:
+                    continue
+                StatusCertificates = self.ListAll(Status)
+                if StatusCertificates is False:
+                    continue
+                SeenID = {Certificate.id for Certificate in StatusCertificates}
+                # Certificate left this status since last sync
+                for CertificateID,Certificate in list(MirrorData['certificates'].items()):
+                    if Certificate.get("status") == Status and CertificateID not in SeenID:
+                        MirrorData['certificates'].pop(CertificateID)
+                for Certificate in StatusCertificates:
+                    if Certificate.id:
+                        MirrorData['certificates'][Certificate.id] = Certificate.ToDict()
+                MirrorData['synced'][Status] = Now
+                MirrorChanged = True
+            if MirrorChanged:
+                AtomicFile.Write(self.MirrorFile,json.dumps(MirrorData),FileMode=0o600)
+            return MirrorData
+        try:
+            return self.MirrorLock.Run(Refresh)
+        except Exception as SyncError:
+            a4zlog.exception(f"Error occurred during syncing certificates mirror |{SyncError}")
+            return False
+
+    # Adding or updating single certificate in mirror
+    def MirrorUpdate(self,Certificate):
+        Certificate = CertificateInfo.FromDict(Certificate)
+        def Update():
+            MirrorData = self.ReadMirror()
+            MirrorData['certificates'][Certificate.id] = Certificate.ToDict()
+            AtomicFile.Write(self.MirrorFile,json.dumps(MirrorData),FileMode=0o600)
+        try:
+            if Certificate.id:
+                self.MirrorLock.Run(Update)
+        except Exception as MirrorUpdateError:
+            a4zlog.warning(f"Unable update certificates mirror |{MirrorUpdateError}")
+
+    # Certificate domains as set
+    @staticmethod
+    def CertificateDomains(Certificate):
+        DomainSet = {str(Domain).strip().lower() for Domain in CertificateInfo.FromDict(Certificate).Domains}
+        DomainSet.discard("")
+        return DomainSet
+
+    # Certificate created from CSR, MD5 of CSR inside CNAME name or validation file name
+    def MatchCSR(self,Certificate,CSRMD5):
+        CSRMD5 = CSRMD5.upper()
+        for Record in CertificateInfo.FromDict(Certificate).records:
+            if str(Record.cname).upper().startswith(f"_{CSRMD5}."):
+                return True
+            if f"/{CSRMD5}.TXT" in str(Record.url).upper():
+                return True
+        return False
+
+    # In-flight certificate for same domains and CSR
+    def FindReusable(self):
+        try:
+            CSRHashes = self.CSRHash()
+            if not isinstance(CSRHashes,list):
+                return False
+            MirrorData = self.Sync()
+            if not isinstance(MirrorData,dict):
+                return False
+            DomainSet = {Domain.strip().lower() for Domain in self.DomainList if isinstance(Domain,str) and Domain.strip()}
+            for Certificate in MirrorData['certificates'].values():
+                Certificate = CertificateInfo.FromDict(Certificate)
+                if Certificate.status not in self.ReuseStatus or self.CertificateDomains(Certificate) != DomainSet:
+                    continue
+                # Listing may not include validation details
+                if not Certificate.records:
+                    CertificateStatus = self.Status(Certificate.id)
+                    if not isinstance(CertificateStatus,dict) or CertificateStatus.get("status") not in self.ReuseStatus:
+                        continue
+                    Certificate = CertificateInfo.FromDict(CertificateStatus)
+                if self.MatchCSR(Certificate,CSRHashes[0]):
+                    return Certificate.ToDict()
+            return False
+        except Exception as FindReusableError:
+            a4zlog.exception(f"Error occurred during searching reusable certificate |{FindReusableError}")
+            return False
+
+    # Reuse in-flight certificate, otherwise sending create request
+    def CreateOrReuse(self):
+        ReusableCertificate = self.FindReusable() if self.Reuse else False
+        if not isinstance(ReusableCertificate,dict):
+            CreateResponData = self.Create()
+            if isinstance(CreateResponData,dict):
+                self.MirrorUpdate(CreateResponData)
+            return CreateResponData
+        a4zlog.info(f"Reuse in-flight certificate |{ReusableCertificate.get('id')}")
+        AtomicFile.Write(self.Validation,json.dumps(ReusableCertificate,indent=4),FileMode=0o600)
+        Path(self.ZeroSSLCSR).unlink(missing_ok=True)
+        return ReusableCertificate
+
+    # Verify data as legacy keys and per domain list, common name first
+    @staticmethod
+    def VerifyShape(VerifyCertificateID,DomainRecords):
+        CreateCAVerify = {"id":VerifyCertificateID,"domains":DomainRecords}
+        if DomainRecords:
+            CreateCAVerify["common_name"] = DomainRecords[0]
+        if len(DomainRecords) > 1:
+            CreateCAVerify["additional_domains"] = DomainRecords[1]
+        return CreateCAVerify
+
+    # Parsing ZeroSSL verify JSON, single pass over validation methods
+    def PhrasingVerifyJSON(self,VerifyRequest,ValidationMethod="CNAME_CSR_HASH"):
+        try:
+            if ValidationMethod not in ("CNAME_CSR_HASH","HTTPS_CSR_HASH"):
                 a4zlog.warning(f"Unable parsing ZeroSSL verify data |Validation mode {ValidationMethod}")
                 return False
+            OtherMethods = (VerifyRequest.get(self.L1) or {}).get(self.L2) or {}
+            DomainRecords = {}
+            for Domain,DomainMethods in OtherMethods.items():
+                if not isinstance(DomainMethods,dict):
+                    continue
+                # CNAME_CSR_HASH
+                if ValidationMethod == "CNAME_CSR_HASH":
+                    DomainRecords[Domain] = {"domain":Domain,"cname_id":self.RecordIDs.get(Domain,""),
+                                             "cname":DomainMethods.get(self.CNAME,""),"value":DomainMethods.get(self.VALUE,"")}
+                # HTTPS_CSR_HASH, file path relative to webpage folder
+                else:
+                    FileURL = DomainMethods.get(self.FILE,"")
+                    DomainRecords[Domain] = {"domain":Domain,"file":FileURL.replace(f"https://{Domain}/",""),
+                                             "content":DomainMethods.get(self.CONTENT,""),"url":FileURL}
+            # Configured domain order, common name always present
+            if ValidationMethod == "CNAME_CSR_HASH":
+                EmptyRecord = {"domain":self.CommonName,"cname_id":self.CommonNameID,"cname":"","value":""}
+            else:
+                EmptyRecord = {"domain":self.CommonName,"file":"","content":"","url":""}
+            OrderedRecords = [DomainRecords.get(self.CommonName) or EmptyRecord]
+            OrderedRecords.extend(DomainRecords[Domain] for Domain in self.Domains[1:] if Domain in DomainRecords)
+            OrderedRecords.extend(DomainRecord for Domain,DomainRecord in DomainRecords.items() if Domain not in self.Domains)
+            return self.VerifyShape(VerifyRequest.get("id",None),OrderedRecords)
         # Error
         except Exception as VerifyDataPhrasingError:
             a4zlog.exception(f"Error occurred during parsing ZeroSSL verify data |{VerifyDataPhrasingError}")
             return False
-        # QC 2026E03, CNAME-PASS HTTPS_FILE-PENDING
+
+    # CSR hash, MD5 and SHA-256 of DER encoded CSR
+    def CSRHash(self):
+        try:
+            CSRFile = Path(self.ZeroSSLCSR)
+            with CSRFile.open("r") as CSRFileData:
+                CSRPayload = CSRFileData.read()
+            CSRBody = "".join(CSRLine.strip() for CSRLine in CSRPayload.splitlines() if CSRLine.strip() and not CSRLine.startswith("-----"))
+            CSRDER = base64.b64decode(CSRBody)
+            return [hashlib.md5(CSRDER).hexdigest().upper(),hashlib.sha256(CSRDER).hexdigest().upper()]
+        except Exception as CSRHashError:
+            a4zlog.exception(f"Error occurred during hashing CSR |{CSRHashError}")
+            return False
+
+    # Computing CNAME challenge records locally from CSR, same structure as PhrasingVerifyJSON
+    def PhrasingLocalCNAME(self):
+        try:
+            CSRHashes = self.CSRHash()
+            if not isinstance(CSRHashes,list):
+                return False
+            CSRMD5,CSRSHA256 = CSRHashes
+            # Challenge value, SHA-256 split as two labels
+            CNAMEValue = f"{CSRSHA256[:32]}.{CSRSHA256[32:]}.{self.CNAMETarget}"
+            LocalRecords = [{"domain":Domain,"cname_id":self.RecordIDs.get(Domain,""),"cname":f"_{CSRMD5}.{Domain}","value":CNAMEValue} for Domain in self.Domains]
+            return self.VerifyShape(None,LocalRecords)
+        except Exception as LocalCNAMEError:
+            a4zlog.exception(f"Error occurred during computing local CNAME records |{LocalCNAMEError}")
+            return False
+
+    # Cross-check local computed records with ZeroSSL verify data, return records need update
+    def CompareCNAME(self,LocalVerify,VerifyData):
+        UpdatePending = []
+        LocalPayloads = {LocalPayload.get("domain"):LocalPayload for LocalPayload in LocalVerify.get("domains") or []}
+        for RemotePayload in VerifyData.get("domains") or []:
+            LocalPayload = LocalPayloads.get(RemotePayload.get("domain")) or {}
+            for PayloadKey in ("cname","value"):
+                if str(LocalPayload.get(PayloadKey,"")).rstrip(".").lower() != str(RemotePayload.get(PayloadKey,"")).rstrip(".").lower():
+                    a4zlog.info(f"Local CNAME record mismatch |{RemotePayload.get('domain')} |{PayloadKey}")
+                    UpdatePending.append(RemotePayload)
+                    break
+        return UpdatePending
 
     # Verification, when using CNAME and HTTP/HTTPS file verify
     def Verification(self,CertificateID=None,ValidationMethod="CNAME_CSR_HASH"):
         try:
+            self.LastError = None
             # Reading certificate hash from cache
             if CertificateID is None or not str(CertificateID).strip():
                 CacheInput = Path(self.Validation)
@@ -645,17 +2586,18 @@ class ZeroSSL():
             VerificationREST = (self.Com.ZeroSSL + f"/{CertificateID}/challenges?access_key={self.ZeroSSLAuth}")
             VerifyMethodData = {"validation_method":ValidationMethod}
             VerifyMethodJSON = json.dumps(VerifyMethodData)
-            with requests.Session() as RequestVerification:
-                VerificationRespon = RequestVerification.post(VerificationREST,headers=self.ZeroSSLHeader,data=VerifyMethodJSON,timeout=30)
-                if VerificationRespon.status_code == 200:
-                    VerificationResponData = VerificationRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {VerificationRespon.status_code}")
-                    return False
+            VerificationRespon = self.Http.Request("POST",VerificationREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,data=VerifyMethodJSON,timeout=30)
+            if VerificationRespon.status_code == 200:
+                VerificationResponData = VerificationRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",VerificationRespon.status_code)
+                a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {VerificationRespon.status_code}")
+                return False
             # Possible errors respon
             VerifyCheck = VerificationResponData.get("success")
             if VerifyCheck == False:
                 VerifyErrorStatus = VerificationResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,VerifyErrorStatus)
                 a4zlog.warning(f"Error occurred during verification |API {VerifyErrorStatus}")
                 return False
             # Get certificate status
@@ -669,6 +2611,7 @@ class ZeroSSL():
     # Download certificate from ZeroSSL
     def Download(self,CertificateID=None):
         try:
+            self.LastError = None
             # Reading certificate hash from cache
             if CertificateID is None or not str(CertificateID).strip():
                 CacheInput = Path(self.Validation)
@@ -681,17 +2624,18 @@ class ZeroSSL():
             # Download
             CertificateDownloadREST = (self.Com.ZeroSSL + f"/{CertificateID}/download/return?access_key={self.ZeroSSLAuth}")
             # ZeroSSL Inline download certificate need JSON header
-            with requests.Session() as RequestDownload:
-                DownloadRespon = RequestDownload.get(CertificateDownloadREST,headers=self.ZeroSSLHeader,timeout=30)
-                if DownloadRespon.status_code == 200:
-                    DownloadResponData = DownloadRespon.json()
-                else:
-                    a4zlog.error(f"Unable connect ZeroSSL API |HTTP {DownloadRespon.status_code}")
-                    return False
+            DownloadRespon = self.Http.Request("GET",CertificateDownloadREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,timeout=30)
+            if DownloadRespon.status_code == 200:
+                DownloadResponData = DownloadRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",DownloadRespon.status_code)
+                a4zlog.error(f"Unable connect ZeroSSL API |HTTP {DownloadRespon.status_code}")
+                return False
             # Possible errors respon
             DownloadCheck = DownloadResponData.get("success")
             if DownloadCheck == False:
                 DownloadErrorStatus = DownloadResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,DownloadErrorStatus)
                 a4zlog.warning(f"Error occurred during download certificate |API {DownloadErrorStatus}")
                 return False
             # Return certificate payload, inline mode check
@@ -704,21 +2648,86 @@ class ZeroSSL():
             return False
         # QC 2026E03
 
+    # Get certificate information from ZeroSSL
+    def Status(self,CertificateID=None):
+        try:
+            self.LastError = None
+            # Reading certificate hash from cache
+            if CertificateID is None or not str(CertificateID).strip():
+                CacheInput = Path(self.Validation)
+                with CacheInput.open("r",encoding="utf-8") as CacheFile:
+                    CacheData = json.load(CacheFile)
+                CertificateID = CacheData.get("id")
+            if not CertificateID:
+                a4zlog.warning("Certificate ID is empty after cache fallback")
+                return False
+            CertificateStatusREST = (self.Com.ZeroSSL + f"/{CertificateID}?access_key={self.ZeroSSLAuth}")
+            StatusRespon = self.Http.Request("GET",CertificateStatusREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,timeout=30)
+            if StatusRespon.status_code == 200:
+                StatusResponData = StatusRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",StatusRespon.status_code)
+                a4zlog.warning(f"Unable connect ZeroSSL API |HTTP {StatusRespon.status_code}")
+                return False
+            # Possible errors respon
+            StatusCheck = StatusResponData.get("success")
+            if StatusCheck == False:
+                StatusErrorStatus = StatusResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,StatusErrorStatus)
+                a4zlog.warning(f"Error occurred during check certificate status |API {StatusErrorStatus}")
+                return False
+            return StatusResponData
+        except Exception as StatusCAError:
+            a4zlog.exception(f"Error occurred during check certificate status |{StatusCAError}")
+            return False
+
+    # Waiting certificate issued then download, polling interval grows until deadline
+    def WaitIssued(self,CertificateID=None,Deadline=300,Initial=2,Maximum=30):
+        try:
+            DeadlineTime = monotonic() + Deadline
+            PollInterval = Initial
+            while True:
+                CertificateStatus = self.Status(CertificateID)
+                if isinstance(CertificateStatus,dict):
+                    CertificateID = CertificateStatus.get("id",CertificateID)
+                    IssueStatus = CertificateStatus.get("status")
+                    # Issued, download certificate
+                    if IssueStatus == "issued":
+                        DownloadResult = self.Download(CertificateID)
+                        if isinstance(DownloadResult,dict):
+                            return DownloadResult
+                    # Certificate no longer issuable
+                    elif IssueStatus in ("cancelled","revoked","expired"):
+                        a4zlog.warning(f"Certificate will not be issued |Status {IssueStatus}")
+                        return False
+                # Deadline check
+                RemainTime = DeadlineTime - monotonic()
+                if RemainTime <= 0:
+                    a4zlog.warning(f"Certificate not issued before deadline |{Deadline}s")
+                    return False
+                sleep(min(PollInterval,RemainTime))
+                PollInterval = min(PollInterval * 2,Maximum)
+        except Exception as WaitIssuedError:
+            a4zlog.exception(f"Error occurred during waiting certificate issued |{WaitIssuedError}")
+            return False
+
     # Cancel certificate from ZeroSSL
     def Cancel(self,CertificateID):
         try:
+            self.LastError = None
             CertificateCancelREST = (self.Com.ZeroSSL + f"/{CertificateID}/cancel?access_key={self.ZeroSSLAuth}")
-            with requests.Session() as RequestCancel:
-                CancelRespon = RequestCancel.post(CertificateCancelREST,headers=self.ZeroSSLHeader,timeout=30)
-                if CancelRespon.status_code == 200:
-                    CancelResponData = CancelRespon.json()
-                else:
-                    a4zlog.error(f"Unable connect ZeroSSL API |HTTP {CancelRespon.status_code}")
-                    return False
+            CancelRespon = self.Http.Request("POST",CertificateCancelREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,timeout=30)
+            if CancelRespon.status_code == 200:
+                CancelResponData = CancelRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",CancelRespon.status_code)
+                a4zlog.error(f"Unable connect ZeroSSL API |HTTP {CancelRespon.status_code}")
+                return False
             # Check status
             CancelStatus = CancelResponData.get("success")
             if CancelStatus == False:
                 CancelErrorStatus = CancelResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,CancelErrorStatus)
                 a4zlog.warning(f"Error occurred during cancel certificate |API {CancelErrorStatus}")
                 return False
             return CancelResponData
@@ -730,23 +2739,25 @@ class ZeroSSL():
     # Revoke certificate from ZeroSSL
     def Revoke(self,CertificateID,RevokeReason=None):
         try:
+            self.LastError = None
             # Unspecified revoke reason
             if RevokeReason is None:
                 RevokeReason = "Unspecified"
             RevokeReasonData = {"reason":f"{RevokeReason}"}
             RevokeReasonJSON = json.dumps(RevokeReasonData)
             CertificateRevokeREST = (self.Com.ZeroSSL + f"/{CertificateID}/revoke?access_key={self.ZeroSSLAuth}")
-            with requests.Session() as RequestRevoke:
-                RevokeRespon = RequestRevoke.post(CertificateRevokeREST,headers=self.ZeroSSLHeader,data=RevokeReasonJSON,timeout=30)
-                if RevokeRespon.status_code == 200:
-                    RevokeResponData = RevokeRespon.json()
-                else:
-                    a4zlog.error(f"Unable connect ZeroSSL API |HTTP {RevokeRespon.status_code}")
-                    return False
+            RevokeRespon = self.Http.Request("POST",CertificateRevokeREST,Provider="ZeroSSL",headers=self.ZeroSSLHeader,data=RevokeReasonJSON,timeout=30)
+            if RevokeRespon.status_code == 200:
+                RevokeResponData = RevokeRespon.json()
+            else:
+                self.LastError = APIError("ZeroSSL",RevokeRespon.status_code)
+                a4zlog.error(f"Unable connect ZeroSSL API |HTTP {RevokeRespon.status_code}")
+                return False
             # Check status
             RevokeStatus = RevokeResponData.get("success")
             if RevokeStatus == False:
                 RevokeErrorStatus = RevokeResponData.get("error",{}).get("type","Unknown error")
+                self.LastError = APIError("ZeroSSL",200,RevokeErrorStatus)
                 a4zlog.warning(f"Error occurred during revoke certificate |API {RevokeErrorStatus}")
                 return False
             return RevokeResponData
@@ -755,8 +2766,122 @@ class ZeroSSL():
             return False
         # QC 2026E03
 
+# Bulk cancel or revoke, bounded concurrency with resumable journal
+class BulkOperation():
+    def __init__(self,ConfigFile,Journal=None,Workers=4):
+        try:
+            self.Zs          = ZeroSSL(ConfigFile)
+            self.Workers     = int(Workers)
+            # JSON lines, one line per finished certificate
+            self.JournalFile = Path(Journal or Path(self.Zs.Validation).with_name("zerossl.bulk.jsonl"))
+            self.Lock        = threading.Lock()
+            self.Actions     = ("cancel","revoke")
+        except Exception as BulkInitialError:
+            a4zlog.exception(f"BulkOperation__init__ |{BulkInitialError}")
+            raise
+
+    # Certificate created time
+    @staticmethod
+    def CreatedTime(Certificate):
+        try:
+            return datetime.datetime.strptime(CertificateInfo.FromDict(Certificate).created,"%Y-%m-%d %H:%M:%S").replace(tzinfo=datetime.timezone.utc)
+        except (TypeError,ValueError):
+            return None
+
+    # Selecting certificates by ID, status, domain pattern and age in days
+    def Select(self,IDs=None,Status=None,Domain=None,OlderThan=None):
+        try:
+            if not (IDs or Status or Domain or OlderThan):
+                a4zlog.warning("Bulk operation selector is empty")
+                return False
+            if IDs:
+                # IDs only, no lookup needed
+                if not (Status or Domain or OlderThan):
+                    return [CertificateInfo(CertificateID) for CertificateID in dict.fromkeys(IDs)]
+                Candidates = [self.Zs.Status(CertificateID) for CertificateID in dict.fromkeys(IDs)]
+                Candidates = [CertificateInfo.FromDict(Candidate) for Candidate in Candidates if isinstance(Candidate,dict)]
+            else:
+                # Plain domain narrowed by API search, pattern matched locally
+                Search = Domain if Domain and not any(Wildcard in Domain for Wildcard in "*?[") else None
+                Candidates = self.Zs.ListAll(Status,Search)
+                if Candidates is False:
+                    return False
+            Selected = []
+            CurrentTime = datetime.datetime.now(tz=datetime.timezone.utc)
+            for Candidate in Candidates:
+                if Status and Candidate.status not in str(Status).split(","):
+                    continue
+                if Domain and not any(fnmatch.fnmatch(CertDomain,Domain.lower()) for CertDomain in ZeroSSL.CertificateDomains(Candidate)):
+                    continue
+                if OlderThan:
+                    CreatedTime = self.CreatedTime(Candidate)
+                    if CreatedTime is None or (CurrentTime - CreatedTime).days < OlderThan:
+                        continue
+                Selected.append(Candidate)
+            return Selected
+        except Exception as SelectError:
+            a4zlog.exception(f"Error occurred during selecting certificates |{SelectError}")
+            return False
+
+    # Finished certificate ID in journal for action
+    def Completed(self,Action):
+        CompletedID = set()
+        try:
+            with self.JournalFile.open("r",encoding="utf-8") as JournalContent:
+                for JournalLine in JournalContent:
+                    try:
+                        JournalEntry = json.loads(JournalLine)
+                    except ValueError:
+                        continue
+                    if JournalEntry.get("action") == Action and JournalEntry.get("result") == "done":
+                        CompletedID.add(JournalEntry.get("id"))
+        except FileNotFoundError:
+            pass
+        return CompletedID
+
+    # Appending journal line, flushed before next certificate
+    def Record(self,JournalEntry):
+        with self.Lock:
+            self.JournalFile.parent.mkdir(parents=True,exist_ok=True)
+            with self.JournalFile.open("a",encoding="utf-8") as JournalContent:
+                JournalContent.write(json.dumps(JournalEntry) + "\n")
+                JournalContent.flush()
+                os.fsync(JournalContent.fileno())
+
+    # Single certificate, cancel or revoke
+    def Process(self,Action,CertificateID,RevokeReason=None):
+        if Action == "cancel":
+            ActionResult = self.Zs.Cancel(CertificateID)
+        else:
+            ActionResult = self.Zs.Revoke(CertificateID,RevokeReason)
+        JournalEntry = {"id":CertificateID,"action":Action,"result":"done" if isinstance(ActionResult,dict) else "failed",
+                        "time":datetime.datetime.now(tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")}
+        self.Record(JournalEntry)
+        return JournalEntry
+
+    # Running action on selected certificates, finished certificates in journal skipped
+    def Run(self,Action,Selected,RevokeReason=None,Resume=True):
+        try:
+            if Action not in self.Actions:
+                a4zlog.warning(f"Unknown bulk operation |{Action}")
+                return False
+            CompletedID = self.Completed(Action) if Resume else set()
+            SelectedID = [CertificateInfo.FromDict(Certificate).id for Certificate in Selected]
+            PendingID = [CertificateID for CertificateID in SelectedID if CertificateID and CertificateID not in CompletedID]
+            BulkResults = []
+            if PendingID:
+                with ThreadPoolExecutor(max_workers=max(1,min(self.Workers,len(PendingID)))) as BulkPool:
+                    BulkResults = list(BulkPool.map(lambda CertificateID: self.Process(Action,CertificateID,RevokeReason),PendingID))
+            BulkSummary = {"done":sum(1 for BulkResult in BulkResults if BulkResult["result"] == "done"),
+                           "failed":sum(1 for BulkResult in BulkResults if BulkResult["result"] == "failed"),
+                           "skipped":len(Selected) - len(PendingID)}
+            return {"summary":BulkSummary,"results":BulkResults}
+        except Exception as BulkRunError:
+            a4zlog.exception(f"Error occurred during bulk {Action} |{BulkRunError}")
+            return False
+
 # cPanel UAPI
-class Cpanel():
+class Cpanel(APIClient):
     def __init__(self,ConfigFile):
         try:
             self.CpanelConfig  = Configuration(ConfigFile).Load
@@ -765,6 +2890,7 @@ class Cpanel():
             self.CpanelAuth    = self.CpanelConfig['Cpanel']['Token']
             # Generate cPanel API request header
             self.CpanelHeader = {"Authorization": f"cpanel {self.CpanelUser}:{self.CpanelAuth}"}
+            self.Http = Transport.Shared(self.CpanelConfig)
             # File path
             self.ActivePK      = self.CpanelConfig['Certificate']['PK']
             self.Certificate   = self.CpanelConfig['Certificate']['CA']
@@ -774,6 +2900,8 @@ class Cpanel():
             self.CommonName    = self.DomainList[0] if len(self.DomainList) > 0 else ""
             # certificate validity days
             self.ValidityDays  = self.CpanelConfig['Certificate']['ValidityDays']
+            # Last API error, structured error for caller
+            self.LastError     = None
         except Exception as CpanelInitialError:
             a4zlog.exception(f"Cpanel__init__ |{CpanelInitialError}")
             raise
@@ -781,14 +2909,15 @@ class Cpanel():
     # Check cPanel UAPI status
     def Verify(self):
         try:
+            self.LastError = None
             UAPIVerify = (self.CpanelUAPI + "/execute/Variables/get_session_information")
-            with requests.Session() as VerifyToken:
-                VerifyResponse = VerifyToken.get(UAPIVerify,headers=self.CpanelHeader,timeout=30)
-                if VerifyResponse.status_code == 200:
-                    VerifyResult = VerifyResponse.json()
-                else:
-                    a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {VerifyResponse.status_code}")
-                    return False
+            VerifyResponse = self.Http.Request("GET",UAPIVerify,headers=self.CpanelHeader,timeout=30)
+            if VerifyResponse.status_code == 200:
+                VerifyResult = VerifyResponse.json()
+            else:
+                self.LastError = APIError("cPanel",VerifyResponse.status_code)
+                a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {VerifyResponse.status_code}")
+                return False
             # Check UAPI respon status
             VerifyStatus = VerifyResult.get("status")
             if VerifyStatus == 1:
@@ -796,6 +2925,7 @@ class Cpanel():
             # Error check
             else:
                 VerifyError = VerifyResult.get("errors")
+                self.LastError = APIError("cPanel",200,VerifyError)
                 a4zlog.warning(f"Error occurred during Connect cPanel UAPI |{VerifyError}")
                 return False
         except Exception as VerifyError:
@@ -806,6 +2936,7 @@ class Cpanel():
     # Upload certificate to cPanel
     def UploadCertificate(self):
         try:
+            self.LastError = None
             # Read certificate
             CertificateFile = Path(self.Certificate)
             with CertificateFile.open("r") as CertificateFileString:
@@ -813,13 +2944,13 @@ class Cpanel():
             CertificateData = {"crt":CertificateString}
             # Upload certificate to cPanel UAPI
             UAPIUploadCert = (self.CpanelUAPI + "/execute/SSL/upload_cert")
-            with requests.Session() as UAPICertUpload:
-                UAPICertUploadRespon = UAPICertUpload.post(UAPIUploadCert,headers=self.CpanelHeader,data=CertificateData,timeout=30)
-                if UAPICertUploadRespon.status_code == 200:
-                    UAPICertUploadResult = UAPICertUploadRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {UAPICertUploadRespon.status_code}")
-                    return False
+            UAPICertUploadRespon = self.Http.Request("POST",UAPIUploadCert,headers=self.CpanelHeader,data=CertificateData,timeout=30)
+            if UAPICertUploadRespon.status_code == 200:
+                UAPICertUploadResult = UAPICertUploadRespon.json()
+            else:
+                self.LastError = APIError("cPanel",UAPICertUploadRespon.status_code)
+                a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {UAPICertUploadRespon.status_code}")
+                return False
             # Check UAPI respon status
             UAPICertUploadStatus = UAPICertUploadResult.get("status")
             if UAPICertUploadStatus == 1:
@@ -827,6 +2958,7 @@ class Cpanel():
             # Error check
             else:
                 UAPICertUploadError = UAPICertUploadResult.get("errors")
+                self.LastError = APIError("cPanel",200,UAPICertUploadError)
                 a4zlog.warning(f"Error occurred during Connect cPanel UAPI |{UAPICertUploadError}")
                 return False
         except Exception as CertificateUploadError:
@@ -837,6 +2969,7 @@ class Cpanel():
     # Upload private key to cPanel
     def UploadPrivateKey(self):
         try:
+            self.LastError = None
             # Read private key
             PKFile = Path(self.ActivePK)
             with PKFile.open("r") as PKFileString:
@@ -844,13 +2977,13 @@ class Cpanel():
             PrivateKeyData = {"key":PKString}
             # Upload private key to cPanel UAPI
             UAPIUploadPrivateKey = (self.CpanelUAPI + "/execute/SSL/upload_key")
-            with requests.Session() as UAPIPrivateKeyUpload:
-                PrivateKeyUploadRespon = UAPIPrivateKeyUpload.post(UAPIUploadPrivateKey,headers=self.CpanelHeader,data=PrivateKeyData,timeout=30)
-                if PrivateKeyUploadRespon.status_code == 200:
-                    PrivateKeyUploadResult = PrivateKeyUploadRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {PrivateKeyUploadRespon.status_code}")
-                    return False
+            PrivateKeyUploadRespon = self.Http.Request("POST",UAPIUploadPrivateKey,headers=self.CpanelHeader,data=PrivateKeyData,timeout=30)
+            if PrivateKeyUploadRespon.status_code == 200:
+                PrivateKeyUploadResult = PrivateKeyUploadRespon.json()
+            else:
+                self.LastError = APIError("cPanel",PrivateKeyUploadRespon.status_code)
+                a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {PrivateKeyUploadRespon.status_code}")
+                return False
             # Check UAPI respon status
             PrivateKeyUploadStatus = PrivateKeyUploadResult.get("status")
             if PrivateKeyUploadStatus == 1:
@@ -858,6 +2991,7 @@ class Cpanel():
             # Error check
             else:
                 UAPIPrivateKeyError = PrivateKeyUploadResult.get("errors")
+                self.LastError = APIError("cPanel",200,UAPIPrivateKeyError)
                 a4zlog.warning(f"Error occurred during Connect cPanel UAPI |{UAPIPrivateKeyError}")
                 return False
         except Exception as CPrivateKeyUploadError:
@@ -867,7 +3001,9 @@ class Cpanel():
 
     # Install certificate to cPanle
     def Install(self):
+        from requests.exceptions import Timeout as RequestTimeout
         try:
+            self.LastError = None
             # Read certificate
             CertificateFile = Path(self.Certificate)
             with CertificateFile.open("r") as CertificateFileString:
@@ -887,13 +3023,13 @@ class Cpanel():
                 "cabundle":CABString}
         # Install
             UAPICertificateInstall = (self.CpanelUAPI + "/execute/SSL/install_ssl")
-            with requests.Session() as UAPIInstallCertificate:
-                CertificateInstallRespon = UAPIInstallCertificate.post(UAPICertificateInstall,headers=self.CpanelHeader,data=InstallData,timeout=180)
-                if CertificateInstallRespon.status_code == 200:
-                    CertificateInstallResult = CertificateInstallRespon.json()
-                else:
-                    a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {CertificateInstallRespon.status_code}")
-                    return False
+            CertificateInstallRespon = self.Http.Request("POST",UAPICertificateInstall,headers=self.CpanelHeader,data=InstallData,timeout=180)
+            if CertificateInstallRespon.status_code == 200:
+                CertificateInstallResult = CertificateInstallRespon.json()
+            else:
+                self.LastError = APIError("cPanel",CertificateInstallRespon.status_code)
+                a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {CertificateInstallRespon.status_code}")
+                return False
             # Check UAPI respon status
             CertificateInstallStatus = CertificateInstallResult.get("status")
             if CertificateInstallStatus == 1:
@@ -901,49 +3037,562 @@ class Cpanel():
             # Error check
             else:
                 UAPIPrivateKeyError = CertificateInstallResult.get("errors")
+                self.LastError = APIError("cPanel",200,UAPIPrivateKeyError)
                 a4zlog.warning(f"Error occurred during Connect cPanel UAPI |{UAPIPrivateKeyError}")
                 return False
         # cPanel UAPI respon timeout is predictable, alternative is check certificate expires directilly
-        except requests.exceptions.Timeout:
+        except RequestTimeout:
             return None
         except Exception as CPrivateKeyUploadError:
             a4zlog.exception(f"Error occurred during install certificate via cPanel UAPI |{CPrivateKeyUploadError}")
             return False
         # QC 2026E03
 
-    # Check installed certificate expires
-    def CertificateCheck(self):
+    # Installed host certificate, parsed as model
+    def HostCertificate(self):
         try:
+            self.LastError = None
             CertVerify = (self.CpanelUAPI + "/execute/SSL/installed_host")
-            with requests.Session() as InstallCertVerify:
-                CertVerifyResponse = InstallCertVerify.get(CertVerify,headers=self.CpanelHeader,timeout=30)
-                if CertVerifyResponse.status_code == 200:
-                    CertVerifyData = CertVerifyResponse.json()
-                else:
-                    a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {CertVerifyResponse.status_code}")
-                    return False
-            # Check UAPI respon status
-            CertVerifyStatus = CertVerifyData.get("status")
-            if CertVerifyStatus == 1:
-                # Get certificate expires
-                CertExpires = CertVerifyData.get("data",{}).get("certificate",{}).get("not_after")
-                if CertExpires is None:
-                    return False
-                else:
-                    # installed certificate expires
-                    CertExpiresDate = datetime.datetime.fromtimestamp(CertExpires,tz=datetime.timezone.utc)
-                    # Local time
-                    CurrentTime = datetime.datetime.now(tz=datetime.timezone.utc)
-                    # Calculate
-                    CertRemineDate = CertExpiresDate - CurrentTime
-                    # Return days as int, with default validity days
-                    return [CertRemineDate.days,self.ValidityDays]
-            # Error check
+            CertVerifyResponse = self.Http.Request("GET",CertVerify,headers=self.CpanelHeader,timeout=30)
+            if CertVerifyResponse.status_code == 200:
+                CertVerifyData = CertVerifyResponse.json()
             else:
+                self.LastError = APIError("cPanel",CertVerifyResponse.status_code)
+                a4zlog.warning(f"Unable connect cPanel UAPI |HTTP {CertVerifyResponse.status_code}")
+                return False
+            # Check UAPI respon status
+            if CertVerifyData.get("status") != 1:
                 CertVerifyError = CertVerifyData.get("errors")
+                self.LastError = APIError("cPanel",200,CertVerifyError)
                 a4zlog.warning(f"Error occurred during Connect cPanel UAPI |{CertVerifyError}")
                 return False
+            return InstalledHost.FromDict(CertVerifyData.get("data") or {})
+        except Exception as HostCertificateError:
+            a4zlog.exception(f"Error occurred during verify cPanel certificate status |{HostCertificateError}")
+            return False
+
+    # Check installed certificate expires
+    def CertificateCheck(self):
+        try:
+            self.LastError = None
+            HostCertificate = self.HostCertificate()
+            if not isinstance(HostCertificate,InstalledHost):
+                return False
+            # Installed certificate remain days
+            RemainDays = HostCertificate.RemainDays()
+            if RemainDays is None:
+                self.LastError = APIError("cPanel",200,"Installed certificate expires unknown")
+                return False
+            # Return days as int, with default validity days
+            return [RemainDays,self.ValidityDays]
         except Exception as VerifyError:
             a4zlog.exception(f"Error occurred during verify cPanel certificate status |{VerifyError}")
             return False
         # 2026E04
+
+# Server reload coordinator, same command run once after last install
+class ReloadCoordinator():
+    def __init__(self,Debounce=0):
+        # Waiting seconds after last install, zero is flush manually
+        self.Debounce = float(Debounce)
+        self.Lock     = threading.Lock()
+        # Command as key, value is command and covered certificates
+        self.Pending  = {}
+        self.Timer    = None
+        self.Results  = []
+
+    # Command as hashable key
+    @staticmethod
+    def CommandKey(ServerCommand):
+        if isinstance(ServerCommand,(list,tuple)):
+            return tuple(ServerCommand)
+        return (ServerCommand,)
+
+    # Installed certificate depend on command, debounce timer restarted
+    def Register(self,ServerCommand,Certificate):
+        with self.Lock:
+            self.Pending.setdefault(self.CommandKey(ServerCommand),[ServerCommand,[]])[1].append(Certificate)
+            if self.Debounce > 0:
+                if self.Timer is not None:
+                    self.Timer.cancel()
+                self.Timer = threading.Timer(self.Debounce,self.Flush)
+                self.Timer.daemon = True
+                self.Timer.start()
+
+    # Running each distinct command once, result with covered certificates
+    def Flush(self):
+        with self.Lock:
+            PendingCommands = self.Pending
+            self.Pending = {}
+            if self.Timer is not None:
+                self.Timer.cancel()
+                self.Timer = None
+        FlushResults = []
+        for ServerCommand,Certificates in PendingCommands.values():
+            try:
+                ReloadStatus = "reloaded" if Runtime.ServerReload(ServerCommand) else "failed"
+            except Exception as ReloadError:
+                a4zlog.exception(f"Error occurred during server reload |{ReloadError}")
+                ReloadStatus = "failed"
+            a4zlog.info(f"Server reload {ReloadStatus} |{ServerCommand} |{len(Certificates)} certificates")
+            FlushResults.append({"command":ServerCommand,"status":ReloadStatus,"certificates":Certificates})
+        with self.Lock:
+            self.Results.extend(FlushResults)
+        return FlushResults
+
+# Renewal pipeline for single certificate, CNAME or HTTPS file validation
+class Renewal():
+    def __init__(self,ConfigFile,ValidationMethod=None,ServerCommand=None):
+        try:
+            self.RenewalConfig    = Configuration(ConfigFile).Load
+            # Validation method and server command, config value as default
+            self.ValidationMethod = ValidationMethod or self.RenewalConfig.get("Validation","CNAME_CSR_HASH")
+            ServerCommand         = ServerCommand or self.RenewalConfig.get("ServerCommand")
+            # String command split as shell words, sequence kept as it is
+            if isinstance(ServerCommand,str):
+                ServerCommand = shlex.split(ServerCommand)
+            self.ServerCommand    = list(ServerCommand) if ServerCommand else None
+            # Compute CNAME records from CSR, update Cloudflare while requesting certificate
+            # Enabled only when CNAMETarget is set, CA may add unique label to target otherwise
+            self.LocalCNAME       = bool((self.RenewalConfig.get("CloudflareRecords") or {}).get("CNAMETarget"))
+            # Timeout for DNS propagation, challenge file and certificate issuance
+            self.PropagationTimeout = 180
+            self.PreflightTimeout   = 60
+            self.Deadline           = 300
+            # Server reload coordinator, reload deferred when assigned
+            self.Reload             = None
+            # CNAME update batcher shared between renewals, optional
+            self.Batch              = None
+            # Renewal stages, checkpoint after each stage
+            self.Stages = ("csr","created","published","verified","downloaded","installed")
+            self.Rt = Runtime(self.RenewalConfig)
+            self.Zs = ZeroSSL(self.RenewalConfig)
+            if self.ValidationMethod == "CNAME_CSR_HASH":
+                self.Cf = Cloudflare(self.RenewalConfig)
+                self.Dp = DNSPropagation(self.RenewalConfig)
+            elif self.ValidationMethod != "HTTPS_CSR_HASH":
+                raise ValueError(f"Unsupported validation method |{self.ValidationMethod}")
+        except Exception as RenewalInitialError:
+            a4zlog.exception(f"Renewal__init__ |{RenewalInitialError}")
+            raise
+
+    # Challenge payload list from verify data
+    @staticmethod
+    def VerifyPayloads(VerifyData):
+        if VerifyData.get('domains'):
+            return list(VerifyData['domains'])
+        ChallengePayloads = [VerifyData['common_name']]
+        if VerifyData.get('additional_domains'):
+            ChallengePayloads.append(VerifyData['additional_domains'])
+        return ChallengePayloads
+
+    # CNAME records update, shared batcher or single batch request
+    def UpdateRecords(self,UpdatePayloads):
+        if not UpdatePayloads:
+            return []
+        if self.Batch is not None:
+            return self.Batch.Submit(self.Cf,UpdatePayloads)
+        return self.Cf.UpdateCNAMEBatch(UpdatePayloads)
+
+    # Publish CNAME records and wait propagation
+    def PublishCNAME(self,VerifyData,LocalVerify=False):
+        ChallengePayloads = self.VerifyPayloads(VerifyData)
+        # Cross-check local computed records, only update mismatch records
+        UpdatePending = self.Zs.CompareCNAME(LocalVerify,VerifyData) if LocalVerify else ChallengePayloads
+        UpdateResults = self.UpdateRecords(UpdatePending)
+        if not all(isinstance(UpdateResult,dict) for UpdateResult in UpdateResults):
+            raise APIError.From(self.Cf,"Error occurred during connect to Cloudflare API update CNAME.")
+        UpdateCount = sum(1 for UpdateResult in UpdateResults if not UpdateResult.get("unchanged"))
+        self.Rt.Message(f"CNAME records published, {UpdateCount} record(s) updated.")
+        if not self.Dp.Wait(ChallengePayloads,Timeout=self.PropagationTimeout):
+            self.Rt.Message("CNAME records not fully propagated before timeout, verify anyway.")
+
+    # Publish challenge files and preflight check
+    def PublishFile(self,VerifyData):
+        ValidationFiles = self.VerifyPayloads(VerifyData)
+        # Same file path shared by domains on one webpage folder, created once
+        UniqueFiles = list({ValidationFile.get("file"):ValidationFile for ValidationFile in ValidationFiles}.values())
+        with ThreadPoolExecutor(max_workers=min(8,max(1,len(UniqueFiles)))) as FilePool:
+            CreateResults = list(FilePool.map(self.Rt.CreateValidationFile,UniqueFiles))
+        if not all(CreateResult is True for CreateResult in CreateResults):
+            raise RuntimeError("Error occurred during create validation file.")
+        if not self.Rt.ValidationFileCheck(ValidationFiles,Timeout=self.PreflightTimeout):
+            self.Rt.Message("Challenge file not served correctly before timeout, verify anyway.")
+
+    # Verify challenge
+    def Verify(self,CertID):
+        CertVerifyCheck = self.Zs.Verification(CertID,ValidationMethod=self.ValidationMethod)
+        if not isinstance(CertVerifyCheck,str):
+            raise APIError.From(self.Zs,"Error occurred during verification.")
+        if CertVerifyCheck == "draft":
+            raise RuntimeError("Not verified yet.")
+        elif CertVerifyCheck not in ("pending_validation","issued"):
+            raise RuntimeError(f"Unable to check verification status, currently verification status: {CertVerifyCheck}")
+        self.Rt.Message("Verify successful, waiting certificate issued.")
+
+    # Waiting certificate issued and download
+    def Download(self,CertID):
+        CertContent = self.Zs.WaitIssued(CertID,Deadline=self.Deadline)
+        if not isinstance(CertContent,dict):
+            raise APIError.From(self.Zs,"Unable download certificate.")
+        self.Rt.Message("Certificate has been downloaded.")
+        return CertContent
+
+    # Read checkpoint from ZeroSSL cache file
+    def LoadCheckpoint(self):
+        try:
+            with Path(self.Zs.Validation).open("r",encoding="utf-8") as CacheFile:
+                CacheData = json.load(CacheFile)
+            return CacheData if isinstance(CacheData,dict) else {}
+        except (FileNotFoundError,ValueError):
+            return {}
+
+    # Write checkpoint into ZeroSSL cache file after each stage
+    def Checkpoint(self,Stage,CacheData,**StageData):
+        RenewalCheckpoint = dict(CacheData.get("renewal") or {})
+        RenewalCheckpoint.update(StageData)
+        RenewalCheckpoint["stage"] = Stage
+        RenewalCheckpoint["method"] = self.ValidationMethod
+        RenewalCheckpoint["updated"] = datetime.datetime.now(tz=datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        CacheData = dict(CacheData,renewal=RenewalCheckpoint)
+        AtomicFile.Write(self.Zs.Validation,json.dumps(CacheData,indent=4),0o600)
+        return CacheData
+
+    # Stage to resume from, None means start over
+    def ResumeStage(self,CacheData):
+        RenewalCheckpoint = CacheData.get("renewal") or {}
+        Stage = RenewalCheckpoint.get("stage")
+        if Stage not in self.Stages or Stage == "installed":
+            return None
+        # Different validation method or pending private key lost
+        if RenewalCheckpoint.get("method") != self.ValidationMethod or not Path(self.Rt.PendingPK).exists():
+            return None
+        if Stage == "csr":
+            return Stage if Path(self.Rt.CSROutput).exists() else None
+        if Stage == "downloaded":
+            return Stage if RenewalCheckpoint.get("certificate") else None
+        # Pending certificate must be still usable
+        CertificateStatus = self.Zs.Status(CacheData.get("id"))
+        if not isinstance(CertificateStatus,dict):
+            return None
+        IssueStatus = CertificateStatus.get("status")
+        if IssueStatus == "draft":
+            return Stage
+        # Already verified before checkpoint written
+        elif IssueStatus in ("pending_validation","issued"):
+            return self.Stages[max(self.Stages.index(Stage),self.Stages.index("verified"))]
+        return None
+
+    # Renew certificate, resume from last checkpoint, error raised as RuntimeError, API error raised as APIError
+    def Run(self,PostInstall=None):
+        IsCNAME = self.ValidationMethod == "CNAME_CSR_HASH"
+        CacheData = self.LoadCheckpoint()
+        ResumeStage = self.ResumeStage(CacheData)
+        StageIndex = self.Stages.index(ResumeStage) if ResumeStage else -1
+        if ResumeStage:
+            self.Rt.Message(f"Resume renewal after stage: {ResumeStage}")
+        # Create certificates signing request
+        if StageIndex < 0:
+            if not isinstance(self.Rt.CreateCSR(),list):
+                raise RuntimeError("Error occurred during Create CSR and Private key.")
+            CacheData = self.Checkpoint("csr",CacheData)
+        # Sending CSR to ZeroSSL
+        LocalVerify = False
+        if StageIndex < 1:
+            # Compute CNAME records from CSR, publish while requesting certificate
+            LocalVerify = self.Zs.PhrasingLocalCNAME() if IsCNAME and self.LocalCNAME else False
+            LocalPayloads = self.VerifyPayloads(LocalVerify) if isinstance(LocalVerify,dict) else []
+            with ThreadPoolExecutor(max_workers=2) as RenewalPool:
+                CreateJob = RenewalPool.submit(self.Zs.CreateOrReuse)
+                LocalUpdateJob = RenewalPool.submit(self.UpdateRecords,LocalPayloads)
+                CertCreate = CreateJob.result()
+                LocalResults = LocalUpdateJob.result()
+                if not (LocalResults and all(isinstance(LocalResult,dict) for LocalResult in LocalResults)):
+                    LocalVerify = False
+            if not isinstance(CertCreate,dict):
+                raise APIError.From(self.Zs,"Error occurred during request new certificate.")
+            CacheData = self.Checkpoint("created",CertCreate)
+        # Phrasing ZeroSSL verify
+        VerifyData = self.Zs.PhrasingVerifyJSON(CacheData,ValidationMethod=self.ValidationMethod)
+        if not isinstance(VerifyData,dict):
+            raise RuntimeError("Error occurred during phrasing ZeroSSL verify data.")
+        CertID = VerifyData.get("id",None)
+        if CertID is None:
+            raise RuntimeError("Certificate hash is empty.")
+        self.Rt.Message(f"Pending certificate hash: {CertID}")
+        try:
+            # Publish challenge
+            if StageIndex < 2:
+                if IsCNAME:
+                    self.PublishCNAME(VerifyData,LocalVerify)
+                else:
+                    self.PublishFile(VerifyData)
+                CacheData = self.Checkpoint("published",CacheData)
+            # Verify challenge
+            if StageIndex < 3:
+                self.Verify(CertID)
+                CacheData = self.Checkpoint("verified",CacheData)
+            # Certificate issued and downloaded, kept in checkpoint until installed
+            if StageIndex < 4:
+                CertContent = self.Download(CertID)
+                CacheData = self.Checkpoint("downloaded",CacheData,certificate=CertContent)
+            else:
+                CertContent = CacheData['renewal']['certificate']
+        finally:
+            if not IsCNAME:
+                for ValidationFile in {ValidationFile.get("file"):ValidationFile for ValidationFile in self.VerifyPayloads(VerifyData)}.values():
+                    self.Rt.DeleteValidationFile(ValidationFile)
+        # Install certificate to server folder
+        InstallCheck = self.Rt.Install(CertContent,self.ServerCommand,self.Reload)
+        if InstallCheck is False:
+            raise RuntimeError("Error occurred during certificate install. You may need to download and install manually.")
+        # Additional install step, e.g. cPanel upload
+        if PostInstall is not None:
+            PostInstall(CertContent)
+        CacheData['renewal'].pop("certificate",None)
+        self.Checkpoint("installed",CacheData)
+        return {"id":CertID,"expires":CacheData.get("expires","Unknown"),"install":InstallCheck}
+
+# Multi-certificate fleet, shared credentials with per certificate entries
+class Fleet():
+    def __init__(self,ConfigFile):
+        try:
+            self.FleetConfig  = Configuration(ConfigFile).Load
+            self.FleetEntries = self.FleetConfig['Fleet'].get("Certificates",())
+            # Bounded renewal concurrency
+            self.Workers      = int(self.FleetConfig['Fleet'].get("Workers",4))
+            # Collecting seconds for batched CNAME update
+            self.BatchWindow  = float(self.FleetConfig['Fleet'].get("BatchWindow",1))
+        except Exception as FleetInitialError:
+            a4zlog.exception(f"Fleet__init__ |{FleetInitialError}")
+            raise
+
+    # Entry configuration, entry sections merged over shared sections
+    def Entries(self):
+        SharedConfig = ConfigurationRegistry.Thaw(self.FleetConfig)
+        SharedConfig.pop("Fleet",None)
+        EntryConfigs = []
+        for FleetEntry in self.FleetEntries:
+            EntryConfig = ConfigurationRegistry.Thaw(SharedConfig)
+            for EntryKey,EntryValue in FleetEntry.items():
+                if isinstance(EntryValue,Mapping) and isinstance(EntryConfig.get(EntryKey),dict):
+                    EntryConfig[EntryKey].update(ConfigurationRegistry.Thaw(EntryValue))
+                else:
+                    EntryConfig[EntryKey] = ConfigurationRegistry.Thaw(EntryValue)
+            EntryConfigs.append(ConfigurationRegistry.Freeze(EntryConfig))
+        return EntryConfigs
+
+    # Expires check for all entries, no network access
+    def Check(self,Minimum=14):
+        CheckResults = []
+        for EntryConfig in self.Entries():
+            CheckResults.append([EntryConfig,Runtime(EntryConfig).ExpiresCheck(Minimum)])
+        return CheckResults
+
+    # Renew single entry, result as dictionary
+    @staticmethod
+    def RenewEntry(EntryConfig,Reload=None,Batch=None):
+        EntryName = EntryConfig['Certificate']['Domains'][0]
+        StartTime = monotonic()
+        try:
+            EntryRenewal = Renewal(EntryConfig)
+            EntryRenewal.Reload = Reload
+            EntryRenewal.Batch = Batch
+            RenewResult = EntryRenewal.Run()
+            return {"domain":EntryName,"status":"renewed","expires":RenewResult.get("expires"),"seconds":round(monotonic() - StartTime,1)}
+        except Exception as RenewEntryError:
+            a4zlog.exception(f"Fleet renewal failed |{EntryName} |{RenewEntryError}")
+            return {"domain":EntryName,"status":"failed","error":str(RenewEntryError),"seconds":round(monotonic() - StartTime,1)}
+
+    # Renew due entries on bounded thread pool, result with summary
+    def Run(self,Minimum=14,Workers=None):
+        try:
+            FleetResults = []
+            DueEntries = []
+            for EntryConfig,ExpiresDays in self.Check(Minimum):
+                if ExpiresDays is None:
+                    DueEntries.append(EntryConfig)
+                else:
+                    FleetResults.append({"domain":EntryConfig['Certificate']['Domains'][0],"status":"valid","days":ExpiresDays})
+            # Server reload once per command after all installs
+            Reload = ReloadCoordinator()
+            # CNAME records of concurrent renewals in one batch request
+            Batch = RecordBatcher(self.BatchWindow)
+            if DueEntries:
+                with ThreadPoolExecutor(max_workers=max(1,min(Workers or self.Workers,len(DueEntries)))) as FleetPool:
+                    FleetResults.extend(FleetPool.map(lambda EntryConfig: self.RenewEntry(EntryConfig,Reload,Batch),DueEntries))
+            ReloadResults = Reload.Flush()
+            FleetSummary = {Status:sum(1 for FleetResult in FleetResults if FleetResult["status"] == Status) for Status in ("valid","renewed","failed")}
+            FleetSummary["total"] = len(FleetResults)
+            FleetSummary["reload_failed"] = sum(1 for ReloadResult in ReloadResults if ReloadResult["status"] == "failed")
+            return {"summary":FleetSummary,"results":FleetResults,"reloads":ReloadResults}
+        except Exception as FleetRunError:
+            a4zlog.exception(f"Error occurred during fleet renewal |{FleetRunError}")
+            return False
+
+# Long-running renewal scheduler, certificates in heap keyed by renewal due time
+class Scheduler():
+    def __init__(self,ConfigFile):
+        try:
+            self.ConfigFile      = ConfigFile
+            self.SchedulerConfig = Configuration(ConfigFile).Load
+            SchedulerSection     = self.SchedulerConfig.get("Scheduler",{})
+            # Renew days before expires, and bounded renewal concurrency
+            self.Minimum         = int(SchedulerSection.get("Minimum",14))
+            self.Workers         = int(SchedulerSection.get("Workers",4))
+            # Configuration change check interval, and retry delay after failed renewal
+            self.ReloadInterval  = float(SchedulerSection.get("ReloadInterval",60))
+            self.RetryDelay      = float(SchedulerSection.get("RetryDelay",3600))
+            # Server reload debounced, run once when no install for seconds
+            self.Reloader        = ReloadCoordinator(SchedulerSection.get("ReloadDelay",30))
+            # CNAME records of concurrent renewals in one batch request
+            self.Batch           = RecordBatcher(SchedulerSection.get("BatchWindow",1))
+            self.Heap            = []
+            self.Entries         = {}
+            self.Running         = {}
+            # Next attempt after failed renewal, kept across configuration reload
+            self.RetryAt         = {}
+            self.Sequence        = itertools.count()
+            self.Wakeup          = threading.Event()
+            self.Stopped         = threading.Event()
+        except Exception as SchedulerInitialError:
+            a4zlog.exception(f"Scheduler__init__ |{SchedulerInitialError}")
+            raise
+
+    # Managed certificates, fleet entries or certificate variants
+    def ManagedEntries(self):
+        if "Fleet" in self.SchedulerConfig:
+            EntryConfigs = Fleet(self.SchedulerConfig).Entries()
+        else:
+            EntryConfigs = Configuration(self.SchedulerConfig).Variants()
+            if EntryConfigs is False:
+                raise ValueError("Invalid dual certificate configuration")
+        # Cache file is unique per certificate
+        return {EntryConfig['ZeroSSLAPI']['Cache']:EntryConfig for EntryConfig in EntryConfigs}
+
+    # Renewal due time as epoch seconds with renewal window jitter, now when certificate not found
+    def DueTime(self,EntryConfig):
+        EntryRuntime = Runtime(EntryConfig)
+        ExpiresTime = EntryRuntime.ExpiresDate()
+        if ExpiresTime is None:
+            return time_ns() / 1e9
+        return EntryRuntime.Window.DueTime(EntryRuntime.CommonName,ExpiresTime,self.Minimum).timestamp()
+
+    # Renewal window admission, certificate not found always admitted
+    def Admit(self,EntryConfig):
+        EntryRuntime = Runtime(EntryConfig)
+        ExpiresTime = EntryRuntime.ExpiresDate()
+        if ExpiresTime is None:
+            return True
+        return EntryRuntime.Window.Admit(EntryRuntime.CommonName,ExpiresTime,self.Minimum)
+
+    # Insert entry into heap
+    def Schedule(self,EntryKey,DueTime):
+        heapq.heappush(self.Heap,(DueTime,next(self.Sequence),EntryKey))
+
+    # Rebuild heap from configuration
+    def Rebuild(self):
+        self.Entries = self.ManagedEntries()
+        self.Heap = []
+        self.RetryAt = {EntryKey:RetryTime for EntryKey,RetryTime in self.RetryAt.items() if EntryKey in self.Entries}
+        for EntryKey,EntryConfig in self.Entries.items():
+            if EntryKey in self.Running:
+                continue
+            if EntryKey in self.RetryAt:
+                self.Schedule(EntryKey,self.RetryAt[EntryKey])
+            else:
+                self.Schedule(EntryKey,self.DueTime(EntryConfig))
+        a4zlog.info(f"Scheduler loaded {len(self.Entries)} certificates")
+
+    # Reload when configuration file changed, registry only parse changed file
+    def Reload(self):
+        if isinstance(self.ConfigFile,Mapping):
+            return False
+        try:
+            ReloadConfig = Configuration(self.ConfigFile).Load
+        except Exception as ReloadError:
+            a4zlog.warning(f"Scheduler keep previous configuration |{ReloadError}")
+            return False
+        if ReloadConfig is self.SchedulerConfig:
+            return False
+        PreviousConfig = self.SchedulerConfig
+        self.SchedulerConfig = ReloadConfig
+        try:
+            self.Rebuild()
+        except Exception as RebuildError:
+            a4zlog.warning(f"Scheduler keep previous configuration |{RebuildError}")
+            self.SchedulerConfig = PreviousConfig
+            return False
+        return True
+
+    # Renewal finished, re-insert with next due time
+    def Finished(self,EntryKey,RenewResult,Callback=None):
+        self.Running.pop(EntryKey,None)
+        EntryConfig = self.Entries.get(EntryKey)
+        # Removed from configuration while renewing
+        if EntryConfig is not None:
+            if RenewResult.get("status") == "renewed":
+                self.RetryAt.pop(EntryKey,None)
+                self.Schedule(EntryKey,self.DueTime(EntryConfig))
+            else:
+                self.RetryAt[EntryKey] = time_ns() / 1e9 + self.RetryDelay
+                self.Schedule(EntryKey,self.RetryAt[EntryKey])
+        if Callback is not None:
+            try:
+                Callback(RenewResult)
+            except Exception as CallbackError:
+                a4zlog.exception(f"Scheduler callback error |{CallbackError}")
+
+    # Stop loop, running renewals are completed
+    def Stop(self):
+        self.Stopped.set()
+        self.Wakeup.set()
+
+    # Scheduler loop, sleep until next due certificate or configuration check
+    def Run(self,Callback=None):
+        try:
+            self.Rebuild()
+            NextReload = monotonic() + self.ReloadInterval
+            with ThreadPoolExecutor(max_workers=max(1,self.Workers)) as SchedulerPool:
+                while not self.Stopped.is_set():
+                    self.Wakeup.clear()
+                    if monotonic() >= NextReload:
+                        self.Reload()
+                        NextReload = monotonic() + self.ReloadInterval
+                    # Collect finished renewals
+                    for EntryKey,RenewFuture in list(self.Running.items()):
+                        if RenewFuture.done():
+                            try:
+                                RenewResult = RenewFuture.result()
+                            except Exception as RenewError:
+                                RenewResult = {"domain":EntryKey,"status":"failed","error":str(RenewError)}
+                            self.Finished(EntryKey,RenewResult,Callback)
+                    # Dispatch due certificates, stale heap items skipped
+                    CurrentTime = time_ns() / 1e9
+                    while self.Heap and self.Heap[0][0] <= CurrentTime and len(self.Running) < self.Workers:
+                        _,_,EntryKey = heapq.heappop(self.Heap)
+                        if EntryKey not in self.Entries or EntryKey in self.Running:
+                            continue
+                        # Hourly cap reached, retry at next free slot
+                        if not self.Admit(self.Entries[EntryKey]):
+                            EntryWindow = RenewalWindow(self.Entries[EntryKey])
+                            self.Schedule(EntryKey,max(EntryWindow.NextSlot(),CurrentTime + 60))
+                            continue
+                        RenewFuture = SchedulerPool.submit(Fleet.RenewEntry,self.Entries[EntryKey],self.Reloader,self.Batch)
+                        RenewFuture.add_done_callback(lambda _: self.Wakeup.set())
+                        self.Running[EntryKey] = RenewFuture
+                    # Sleep until next due time, reload check or renewal finished
+                    SleepSeconds = NextReload - monotonic()
+                    if self.Heap and len(self.Running) < self.Workers:
+                        SleepSeconds = min(SleepSeconds,self.Heap[0][0] - time_ns() / 1e9)
+                    self.Wakeup.wait(max(SleepSeconds,0.1))
+            # Pending reload before exit
+            self.Reloader.Flush()
+            return True
+        except Exception as SchedulerRunError:
+            a4zlog.exception(f"Error occurred during scheduler loop |{SchedulerRunError}")
+            return False
+
+    # Queue snapshot, next due certificates
+    def Pending(self):
+        return [{"entry":EntryKey,"due":datetime.datetime.fromtimestamp(DueTime,tz=datetime.timezone.utc)} for DueTime,_,EntryKey in sorted(self.Heap)]
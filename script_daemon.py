@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import acme4zerossl as acme
+import logging
+import signal
+from sys import exit
+
+# Config load, dictionary or filepath, fleet or single certificate
+ConfigFile = "/Documents/script/acme4zerossl.fleet.json"
+
+# Error handling
+FORMAT = "%(asctime)s |%(levelname)s |%(message)s"
+logging.basicConfig(level=logging.WARNING,filename="acme4zerossl.log",filemode="a",format=FORMAT)
+
+# Renewal result notification
+def RenewNotify(RenewResult):
+    Tg = acme.Telegram(ConfigFile)
+    if RenewResult["status"] == "renewed":
+        Tg.Message(f"{RenewResult['domain']} |renewed, will expires in {RenewResult['expires']}.")
+    else:
+        Tg.Message(f"{RenewResult['domain']} |renewal failed |{RenewResult.get('error')}")
+
+# Runtime, keep running and renew certificates when due
+if __name__ == "__main__":
+    try:
+        Sc = acme.Scheduler(ConfigFile)
+        # Stop after running renewals completed
+        signal.signal(signal.SIGTERM,lambda *_: Sc.Stop())
+        try:
+            SchedulerResult = Sc.Run(Callback=RenewNotify)
+        except KeyboardInterrupt:
+            Sc.Stop()
+            raise
+        exit(0 if SchedulerResult else 1)
+    except KeyboardInterrupt:
+        logging.warning("Manually interrupt.")
+        exit(0)
+    except Exception as RenewedError:
+        logging.exception(f"Script error |{RenewedError}")
+        exit(1)
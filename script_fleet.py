@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import acme4zerossl as acme
+import logging
+from sys import exit
+
+# Config load, dictionary or filepath
+ConfigFile = "/Documents/script/acme4zerossl.fleet.json"
+
+# Error handling
+FORMAT = "%(asctime)s |%(levelname)s |%(message)s"
+logging.basicConfig(level=logging.WARNING,filename="acme4zerossl.log",filemode="a",format=FORMAT)
+
+# Runtime, check all certificates and renew due ones concurrently
+if __name__ == "__main__":
+    try:
+        Fl = acme.Fleet(ConfigFile)
+        FleetEntries = Fl.Entries()
+        if not FleetEntries:
+            logging.info("Fleet is empty.")
+            exit(0)
+        # Shared credentials, first entry as notification header
+        Rt = acme.Runtime(FleetEntries[0])
+        Tg = acme.Telegram(FleetEntries[0])
+        FleetResult = Fl.Run()
+        if not isinstance(FleetResult,dict):
+            raise RuntimeError("Error occurred during fleet renewal.")
+        # Per certificate result
+        for EntryResult in FleetResult["results"]:
+            if EntryResult["status"] == "valid":
+                Rt.Message(f"{EntryResult['domain']} |validity date has {EntryResult['days']} days left.")
+            elif EntryResult["status"] == "renewed":
+                Rt.Message(f"{EntryResult['domain']} |renewed, will expires in {EntryResult['expires']}.")
+            else:
+                Rt.Message(f"{EntryResult['domain']} |renewal failed |{EntryResult['error']}")
+        # Server reload, once per command
+        for ReloadResult in FleetResult["reloads"]:
+            Rt.Message(f"Server reload {ReloadResult['status']} |{ReloadResult['command']} |{', '.join(ReloadResult['certificates'])}")
+        # Summary
+        FleetSummary = FleetResult["summary"]
+        SummaryText = f"Fleet check complete, {FleetSummary['renewed']} renewed, {FleetSummary['failed']} failed, {FleetSummary['valid']} valid."
+        logging.info(SummaryText)
+        if FleetSummary["renewed"] or FleetSummary["failed"]:
+            Tg.Message(SummaryText)
+        exit(1 if FleetSummary["failed"] or FleetSummary["reload_failed"] else 0)
+    except KeyboardInterrupt:
+        logging.warning("Manually interrupt.")
+        exit(0)
+    except Exception as RenewedError:
+        logging.exception(f"Script error |{RenewedError}")
+        exit(1)
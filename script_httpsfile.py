@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import acme4zerossl as acme
 import logging
-from time import sleep
 from sys import exit
 
 # Config load, dictionary or filepath
@@ -13,79 +12,27 @@ ServerCommand  = None
 FORMAT = "%(asctime)s |%(levelname)s |%(message)s"
 logging.basicConfig(level=logging.WARNING,filename="acme4zerossl.log",filemode="a",format=FORMAT)
 # Script
-def main(VerifyRetry,Interval):
-    Rt = acme.Runtime(ConfigFile)
-    Tg = acme.Telegram(ConfigFile)
-    Zs = acme.ZeroSSL(ConfigFile)
-    # Create certificates signing request
-    CSRCreateCheck = Rt.CreateCSR()
-    if not isinstance(CSRCreateCheck,list):
-        raise RuntimeError("Error occurred during Create CSR and Private key.")
-    Rt.Message("Successful create CSR and Private key.")
-    # Sending CSR to ZeroSSL
-    CertCreate = Zs.Create()
-    if not isinstance(CertCreate,dict):
-        raise RuntimeError("Error occurred during request new certificate.")
-    # Phrasing ZeroSSL verify
-    VerifyData =  Zs.PhrasingVerifyJSON(CertCreate,ValidationMethod="HTTPS_CSR_HASH")
-    if not isinstance(VerifyData,dict):
-        raise RuntimeError("Error occurred during phrasing ZeroSSL verify data.")
-    # Check pending certificate ID
-    CertID = VerifyData.get("id",None)
-    if CertID is None:
-        raise RuntimeError("Certificate hash is empty")
-    Rt.Message(f"Request success, pending certificate hash: {CertID}")
-    # Validation file path and content
-    ValidationFiles = [VerifyData['common_name']]
-    AdditionalDomains = VerifyData.get("additional_domains")
-    if AdditionalDomains:
-        ValidationFiles.append(AdditionalDomains)
-    # Create validation file
-    for ValidationFile in ValidationFiles:
-        CreateValidationFileStatus = Rt.CreateValidationFile(ValidationFile)
-        if CreateValidationFileStatus is not True:
-            raise RuntimeError("Error occurred during create validation file.")
-    # Wait server cache
-    sleep(60)
-    # Verify file challenge
-    CertVerifyCheck = Zs.Verification(CertID,ValidationMethod="HTTPS_CSR_HASH")
-    if not isinstance(CertVerifyCheck,str):
-        raise RuntimeError("Error occurred during file verification.")
-    # Check verify status
-    if CertVerifyCheck == "draft":
-        raise RuntimeError("Not verified yet.")
-    # Verify passed (Under CNAME and file validation, pending_validation means verify successful)
-    elif CertVerifyCheck in ("pending_validation","issued"):
-        Rt.Message(f"Verify successful, now downloading certificate.")
-        sleep(30)
-        # Download certificates, adding retry and interval in case backlog certificate issuance
-        for _ in range(VerifyRetry):
-            CertContent = Zs.Download(CertID)
-            # Successful download certificates
-            if isinstance(CertContent,dict):
-                Rt.Message("Certificate has been downloaded.")
-                break
-            sleep(Interval)
-        else:
-            raise RuntimeError(f"Unable download certificate.")
-    # Undefined error
-    else:
-        raise RuntimeError(f"Unable to check verification status, undefined status: {CertVerifyCheck}")
-    # Delete validation file
-    for ValidationFile in ValidationFiles:
-        Rt.DeleteValidationFile(ValidationFile)
-    # Install certificate to server folder
-    InstallCheck = Rt.Install(CertContent,ServerCommand)
-    if InstallCheck is False:
-        raise RuntimeError("Error occurred during certificate install. You may need to download and install manually.")
+def main(ConfigVariant,Deadline):
+    # Load object
+    Tg = acme.Telegram(ConfigVariant)
+    Rn = acme.Renewal(ConfigVariant,ValidationMethod="HTTPS_CSR_HASH",ServerCommand=ServerCommand)
+    Rn.Deadline = Deadline
+    # Create CSR, request certificate, create challenge file, verify, download and install
+    # Each stage checkpointed to cache file, rerun resume pending certificate after interrupted
+    RenewResult = Rn.Run()
+    InstallCheck = RenewResult["install"]
     # Get certificate expires date
-    CertExpiresDate = CertCreate.get("expires","Unknown")
-    if isinstance(InstallCheck,int):
+    CertExpiresDate = RenewResult.get("expires","Unknown")
+    if InstallCheck == 304:
+        Tg.Message(f"Certificate unchanged, install and server reload skipped, will expires in {CertExpiresDate}.")
+        return
+    elif isinstance(InstallCheck,int):
         Tg.Message(f"Certificate been renewed, will expires in {CertExpiresDate}. You may need to restart server manually.")
         return
     elif isinstance(InstallCheck,list):
         Tg.Message(f"Certificate been renewed and installed, will expires in {CertExpiresDate}.")
         return
+
 # Runtime, including check validity date of certificate
 if __name__ == "__main__":
     try:
@@ -95,7 +42,12 @@ if __name__ == "__main__":
         CertExpiresDays = Rt.ExpiresCheck()
         # Renew determination
         if CertExpiresDays is None:
-            main(5,60)
+            # Primary certificate, and dual key certificate if configured
+            ConfigVariants = acme.Configuration(ConfigFile).Variants()
+            if ConfigVariants is False:
+                raise RuntimeError("Invalid dual certificate configuration.")
+            for ConfigVariant in ConfigVariants:
+                main(ConfigVariant,300)
             logging.info("Certificate has been renewed.")
             exit(0)
         # No need to renew
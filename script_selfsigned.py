@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
 import logging
+import os
+import datetime
+import ipaddress
+import tempfile
 from pathlib import Path
 import requests
 import subprocess
@@ -103,13 +107,8 @@ class SelfSignedCertificate():
         except Exception as CreateCSRError:
             raise RuntimeError(f"Unable create CSR Configuration file |{CreateCSRError}")
 
-    # Create Certificate
-    def CertificateSigning(self):
-        # CSR path
-        CSRConfigFile = self.ConfigFolder / self.CSRConfig
-        if not CSRConfigFile.exists():
-            raise RuntimeError("Cannot found CSR configuration file")
-        # Certificate path
+    # Certificate folder path
+    def CertificateFolder(self):
         if self.CertFolder is None or not str(self.CertFolder).strip():
             CertificatesDIR = self.ConfigFolder
         elif isinstance(self.CertFolder,str):
@@ -117,8 +116,85 @@ class SelfSignedCertificate():
         elif isinstance(self.CertFolder,Path):
             CertificatesDIR = self.CertFolder
         else:
-            raise RuntimeError("CSR configuration file path error")
+            raise RuntimeError("Certificate folder path error")
         CertificatesDIR.mkdir(parents=True,exist_ok=True)
+        return CertificatesDIR
+
+    # Create Certificate in-process, cryptography package required
+    def CertificateSigningNative(self,Address4,Address6):
+        try:
+            from cryptography import x509
+            from cryptography.x509.oid import NameOID,ExtendedKeyUsageOID
+            from cryptography.hazmat.primitives import hashes,serialization
+            from cryptography.hazmat.primitives.asymmetric import rsa
+        except ImportError:
+            logging.info("cryptography package not found, using OpenSSL command")
+            return False
+        try:
+            # Alternative names, backup address may be CSR config line
+            AltNames = [x509.DNSName("localhost")]
+            for Address,AddressBackup in ((Address4,self.Address4Backup),(Address6,self.Address6Backup)):
+                if not (isinstance(Address,str) and Address.strip()):
+                    Address = str(AddressBackup or "").split("=")[-1]
+                if Address.strip():
+                    AltNames.append(x509.IPAddress(ipaddress.ip_address(Address.strip())))
+            SubjectName = x509.Name([
+                x509.NameAttribute(NameOID.COUNTRY_NAME,self.Country),
+                x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME,self.State),
+                x509.NameAttribute(NameOID.LOCALITY_NAME,self.Locality),
+                x509.NameAttribute(NameOID.ORGANIZATION_NAME,self.Organization),
+                x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME,self.Unit),
+                x509.NameAttribute(NameOID.COMMON_NAME,"localhost")])
+            PrivateKey = rsa.generate_private_key(public_exponent=65537,key_size=2048)
+            CurrentTime = datetime.datetime.now(tz=datetime.timezone.utc)
+            CertificateBuilder = (x509.CertificateBuilder()
+                .subject_name(SubjectName).issuer_name(SubjectName)
+                .public_key(PrivateKey.public_key())
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(CurrentTime)
+                .not_valid_after(CurrentTime + datetime.timedelta(days=self.Days))
+                .add_extension(x509.BasicConstraints(ca=False,path_length=None),critical=False)
+                .add_extension(x509.KeyUsage(digital_signature=True,key_encipherment=True,content_commitment=False,
+                                             data_encipherment=False,key_agreement=False,key_cert_sign=False,
+                                             crl_sign=False,encipher_only=False,decipher_only=False),critical=False)
+                .add_extension(x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]),critical=False)
+                .add_extension(x509.SubjectAlternativeName(AltNames),critical=False))
+            CertificateContent = CertificateBuilder.sign(PrivateKey,hashes.SHA256())
+            # Write certificate and private key
+            CertificatesDIR = self.CertificateFolder()
+            PrivateKeyPEM = PrivateKey.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption())
+            self.AtomicWrite(CertificatesDIR / self.PrivateKey,PrivateKeyPEM,0o600)
+            self.AtomicWrite(CertificatesDIR / self.Certificate,CertificateContent.public_bytes(serialization.Encoding.PEM),0o644)
+            return True
+        except Exception as CertificateSigningNativeError:
+            logging.warning(f"Unable create certificate in-process, using OpenSSL command |{CertificateSigningNativeError}")
+            return False
+
+    # Write file via temporary file and rename
+    def AtomicWrite(self,FilePath,FileContent,FileMode):
+        TempFD,TempPath = tempfile.mkstemp(prefix=f".{FilePath.name}.",dir=str(FilePath.parent))
+        try:
+            with os.fdopen(TempFD,"wb") as TempFile:
+                TempFile.write(FileContent)
+                TempFile.flush()
+                os.fsync(TempFile.fileno())
+            os.chmod(TempPath,FileMode)
+            os.replace(TempPath,FilePath)
+        except BaseException:
+            Path(TempPath).unlink(missing_ok=True)
+            raise
+
+    # Create Certificate
+    def CertificateSigning(self):
+        # CSR path
+        CSRConfigFile = self.ConfigFolder / self.CSRConfig
+        if not CSRConfigFile.exists():
+            raise RuntimeError("Cannot found CSR configuration file")
+        # Certificate path
+        CertificatesDIR = self.CertificateFolder()
         KeyoutFileStr      = str(CertificatesDIR / self.PrivateKey)
         CertificateFileStr = str(CertificatesDIR / self.Certificate)
         CSRConfigFileStr   = str(CSRConfigFile)
@@ -138,7 +214,9 @@ class SelfSignedCertificate():
         except Exception as CertificateSigningRequestError:
             logging.exception(CertificateSigningRequestError)
             raise RuntimeError(f"Unbale create certificate and private key |{CertificateSigningRequestError}")
-        # Server reload
+
+    # Server reload
+    def ServerReload(self):
         if self.WebServer is not None and isinstance(self.WebServer,list):
             try:
                 ServerStatus = subprocess.Popen(
@@ -159,10 +237,14 @@ try:
     # Unable get IPv6 / IPv4 only env
     if Address4 == Address6:
         Address6 = None
-    # Create CSR config
-    SelfSignCa.CreateCSR(Address4,Address6)
-    # Create Certificate
-    SelfSignCa.CertificateSigning()
+    # Create certificate in-process, OpenSSL command as fallback
+    if not SelfSignCa.CertificateSigningNative(Address4,Address6):
+        # Create CSR config
+        SelfSignCa.CreateCSR(Address4,Address6)
+        # Create Certificate
+        SelfSignCa.CertificateSigning()
+    # Server reload
+    SelfSignCa.ServerReload()
     logging.info(f"Successful create self-signed certificate |{Address4} |{Address6}")
     exit(0)
 except Exception as RunTimeError:
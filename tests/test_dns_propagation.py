@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import socket
+import struct
+import threading
+import pytest
+import acme4zerossl as acme
+
+# Encode domain name as DNS labels
+def EncodeName(Name):
+    return b"".join(bytes([len(Label)]) + Label.encode("ascii") for Label in Name.rstrip(".").split(".")) + b"\x00"
+
+# Local UDP stub, answer CNAME query from records, answer name as compression pointer to question
+class StubDNS():
+    def __init__(self,Records):
+        self.Records = {Name.lower():Target for Name,Target in Records.items()}
+        self.Socket = socket.socket(socket.AF_INET,socket.SOCK_DGRAM)
+        self.Socket.bind(("127.0.0.1",0))
+        self.Socket.settimeout(0.1)
+        self.Address = f"127.0.0.1:{self.Socket.getsockname()[1]}"
+        self.Stopped = threading.Event()
+        self.Thread = threading.Thread(target=self.Serve,daemon=True)
+
+    def Answer(self,Query):
+        QueryID,_,_,_,_,_ = struct.unpack("!HHHHHH",Query[:12])
+        Name,Offset = acme.DNSPropagation.ReadName(Query,12)
+        Question = Query[12:Offset + 4]
+        Target = self.Records.get(Name)
+        if Target is None:
+            # NXDOMAIN
+            return struct.pack("!HHHHHH",QueryID,0x8183,1,0,0,0) + Question
+        TargetName = EncodeName(Target)
+        AnswerRecord = struct.pack("!HHHIH",0xC00C,5,1,60,len(TargetName)) + TargetName
+        return struct.pack("!HHHHHH",QueryID,0x8180,1,1,0,0) + Question + AnswerRecord
+
+    def Serve(self):
+        while not self.Stopped.is_set():
+            try:
+                Query,Client = self.Socket.recvfrom(512)
+            except socket.timeout:
+                continue
+            self.Socket.sendto(self.Answer(Query),Client)
+
+    def __enter__(self):
+        self.Thread.start()
+        return self
+
+    def __exit__(self,*_):
+        self.Stopped.set()
+        self.Thread.join()
+        self.Socket.close()
+
+@pytest.fixture
+def Stub():
+    with StubDNS({"_abcd.www.example.com":"aaaa.bbbb.comodoca.com"}) as StubServer:
+        yield StubServer
+
+def Propagation(Resolver):
+    Dp = acme.DNSPropagation({"CloudflareRecords":{"Resolvers":[Resolver]}})
+    Dp.QueryTimeout = 1
+    return Dp
+
+def test_query_reads_cname_target(Stub):
+    Dp = Propagation(Stub.Address)
+    assert Dp.Query("_ABCD.www.example.com.",Stub.Address) == "aaaa.bbbb.comodoca.com"
+    assert Dp.Query("_missing.www.example.com",Stub.Address) is None
+
+def test_wait_passes_with_expected_target(Stub):
+    Dp = Propagation(Stub.Address)
+    Payload = {"cname":"_abcd.www.example.com","value":"AAAA.BBBB.comodoca.com."}
+    assert Dp.Wait([Payload],Timeout=5,Interval=0.1) is True
+
+def test_wait_times_out_with_wrong_target(Stub):
+    Dp = Propagation(Stub.Address)
+    Payload = {"cname":"_abcd.www.example.com","value":"other.target.comodoca.com"}
+    assert Dp.Wait([Payload],Timeout=0.5,Interval=0.1) is False
+
+def test_read_name_rejects_compression_loop():
+    with pytest.raises(ValueError):
+        acme.DNSPropagation.ReadName(b"\xc0\x00",0)
+
+def test_resolver_address():
+    assert acme.DNSPropagation.ResolverAddress("127.0.0.1:5353") == ("127.0.0.1",5353)
+    assert acme.DNSPropagation.ResolverAddress("[::1]:5353") == ("::1",5353)
+    assert acme.DNSPropagation.ResolverAddress("1.1.1.1") == ("1.1.1.1",53)
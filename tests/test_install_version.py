@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import json
+import base64
+import os
+import time
+from pathlib import Path
+import acme4zerossl as acme
+
+ConfigTemplate = Path(__file__).resolve().parents[1] / "acme4zerossl.config.json"
+
+# Certificate shaped PEM, only fingerprint is read by install
+def FakePEM(Seed):
+    return "-----BEGIN CERTIFICATE-----\n" + base64.b64encode(os.urandom(48) + Seed.encode("ascii")).decode("ascii") + "\n-----END CERTIFICATE-----\n"
+
+def VersionedConfig(Folder,Keep):
+    with ConfigTemplate.open("r",encoding="utf-8") as ConfigContent:
+        Config = json.load(ConfigContent)
+    Current = Folder / "certificate" / "current"
+    Config['Certificate'].update({"PendingPK":str(Folder / "pending.key"),
+                                  "PK":str(Current / "private.key"),
+                                  "CA":str(Current / "certificate.crt"),
+                                  "CAB":str(Current / "ca_bundle.crt"),
+                                  "Outputs":{"Fullchain":str(Current / "nested" / "fullchain.pem")},
+                                  "Versioned":{"Folder":str(Folder / "certificate"),"Keep":Keep}})
+    return Config
+
+def test_versioned_install_prunes_nested_releases(tmp_path):
+    Rt = acme.Runtime(VersionedConfig(tmp_path,1))
+    for Seed in ("first","second","third"):
+        (tmp_path / "pending.key").write_text("PRIVATE KEY")
+        CertificatePEM = FakePEM(Seed)
+        assert Rt.Install({"certificate.crt":CertificatePEM,"ca_bundle.crt":FakePEM("bundle")}) == 200
+        assert not (tmp_path / "pending.key").exists()
+        assert (tmp_path / "certificate" / "current" / "certificate.crt").read_text() == CertificatePEM
+        assert (tmp_path / "certificate" / "current" / "nested" / "fullchain.pem").is_file()
+        # Version folder named by second
+        time.sleep(1.05)
+    Releases = list((tmp_path / "certificate" / "releases").iterdir())
+    assert len(Releases) == 1
+    assert os.path.realpath(tmp_path / "certificate" / "current") == str(Releases[0].resolve())